@@ -24,16 +24,59 @@ Example:
     ... )
 """
 
+import functools
+import logging
 import os
+import types
 import warnings
-from dataclasses import dataclass, field
+from dataclasses import MISSING, dataclass, field, fields
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional
 from enum import Enum
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Set once the .env file has been loaded (see _ensure_env_loaded)
+_ENV_LOADED = False
+
+# Environment variables read by the configs, with their defaults
+_ENV_DEFAULTS = types.MappingProxyType(
+    {
+        "VALHALLA_URL": "http://localhost:8002",
+        "POSTGRES_HOST": "localhost",
+        "POSTGRES_PORT": "5432",
+        "POSTGRES_DB": "peloton_db",
+        "POSTGRES_USER": "peloton",
+        "POSTGRES_PASSWORD": "",
+        "POSTGRES_SCHEMA": "hsl",
+        "OUTPUT_DIR": "",
+    }
+)
+
+
+def _ensure_env_loaded() -> None:
+    """Load environment variables from .env file on first use."""
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _ENV_LOADED = True
+
+
+def _env(name: str) -> str:
+    """Read a config environment variable, falling back to its default.
+
+    Values are read at construction time rather than snapshotted at import,
+    so configs pick up changes made to os.environ after import.
+    """
+    _ensure_env_loaded()
+    return os.environ.get(name) or _ENV_DEFAULTS[name]
+
+
+# Accepted URL prefixes for the Valhalla base URL
+_VALHALLA_URL_SCHEMES = ("http://", "https://")
 
 
 class RouteSelectionType(Enum):
@@ -43,7 +86,7 @@ class RouteSelectionType(Enum):
     PERCENTAGE = "percentage"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RouteSelectionStrategy:
     """Strategy for selecting routes to generate."""
 
@@ -51,6 +94,21 @@ class RouteSelectionStrategy:
     top_n: Optional[int] = None
     coverage_percentage: Optional[float] = None
 
+    # Human-readable description, computed once in __post_init__
+    _str: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Precompute the human-readable description."""
+        self._init_derived()
+
+    def _init_derived(self):
+        """Compute cached fields derived from the init fields."""
+        if self.selection_type is RouteSelectionType.TOP_N:
+            description = f"Top {self.top_n} routes"
+        else:
+            description = f"{self.coverage_percentage}% coverage"
+        object.__setattr__(self, "_str", description)
+
     @classmethod
     def create_top_n(cls, n: int) -> "RouteSelectionStrategy":
         """Create a top-N selection strategy.
@@ -61,9 +119,7 @@ class RouteSelectionStrategy:
         Returns:
             RouteSelectionStrategy configured for top-N selection
         """
-        if n < 1:
-            raise ValueError(f"N must be positive: {n}")
-        return cls(selection_type=RouteSelectionType.TOP_N, top_n=n)
+        return _build_strategy(RouteSelectionType.TOP_N, n, None)
 
     @classmethod
     def create_percentage(cls, pct: float) -> "RouteSelectionStrategy":
@@ -75,21 +131,39 @@ class RouteSelectionStrategy:
         Returns:
             RouteSelectionStrategy configured for percentage coverage
         """
-        if not (0 < pct <= 100):
-            raise ValueError(f"Percentage must be between 0 and 100: {pct}")
-        return cls(
-            selection_type=RouteSelectionType.PERCENTAGE, coverage_percentage=pct
-        )
+        return _build_strategy(RouteSelectionType.PERCENTAGE, None, pct)
 
     def __str__(self) -> str:
         """Human-readable description of strategy."""
-        if self.selection_type == RouteSelectionType.TOP_N:
-            return f"Top {self.top_n} routes"
-        else:
-            return f"{self.coverage_percentage}% coverage"
+        return self._str
+
 
+# typed=True: 80 and 80.0 compare equal but print differently in __str__
+@functools.lru_cache(maxsize=128, typed=True)
+def _build_strategy(
+    selection_type: RouteSelectionType,
+    top_n: Optional[int],
+    coverage_percentage: Optional[float],
+) -> RouteSelectionStrategy:
+    """Validate and build a strategy, reusing instances for repeated arguments.
+
+    Strategies are frozen, so the same instance can be shared between callers.
+    """
+    if selection_type is RouteSelectionType.TOP_N:
+        if top_n is None or top_n < 1:
+            raise ValueError(f"N must be positive: {top_n}")
+    elif coverage_percentage is None or not (0 < coverage_percentage <= 100):
+        raise ValueError(
+            f"Percentage must be between 0 and 100: {coverage_percentage}"
+        )
+    return RouteSelectionStrategy(
+        selection_type=selection_type,
+        top_n=top_n,
+        coverage_percentage=coverage_percentage,
+    )
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class RouteGenerationConfig:
     """Configuration for route generation strategies."""
 
@@ -109,25 +183,41 @@ class RouteGenerationConfig:
     costing: str = "bicycle"
     bicycle_type: str = "Road"
 
+    # Persistent geometry cache (None = disabled); cleared first if requested
+    route_cache_path: Optional[Path] = field(
+        default_factory=lambda: _default_route_cache_path()
+    )
+    clear_route_cache: bool = False
+
+    # Create the covering route index on the trips table if it's missing
+    ensure_route_index: bool = True
+
+    # Enabled flags, computed once in __post_init__
+    _generate_global: bool = field(init=False, repr=False, compare=False)
+    _generate_individual: bool = field(init=False, repr=False, compare=False)
+    _generate_aggregate: bool = field(init=False, repr=False, compare=False)
+
     def should_generate_global(self) -> bool:
         """Check if global routes should be generated."""
-        return self.global_strategy is not None
+        return self._generate_global
 
     def should_generate_individual(self) -> bool:
         """Check if individual station routes should be generated."""
-        return self.individual_strategy is not None
+        return self._generate_individual
 
     def should_generate_aggregate(self) -> bool:
         """Check if per-station aggregate should be generated."""
-        return self.per_station_aggregate_strategy is not None
+        return self._generate_aggregate
 
     def __post_init__(self):
-        """Validate configuration."""
+        """Validate configuration and precompute enabled flags."""
+        self._init_derived()
+
         # At least one strategy must be enabled
         if not (
-            self.should_generate_global()
-            or self.should_generate_individual()
-            or self.should_generate_aggregate()
+            self._generate_global
+            or self._generate_individual
+            or self._generate_aggregate
         ):
             raise ValueError(
                 "At least one of global_strategy, individual_strategy, or "
@@ -144,26 +234,40 @@ class RouteGenerationConfig:
                 f"batch_size must be between 1 and 1000: {self.batch_size}"
             )
 
+    def _init_derived(self):
+        """Compute cached fields derived from the init fields."""
+        object.__setattr__(self, "_generate_global", self.global_strategy is not None)
+        object.__setattr__(
+            self, "_generate_individual", self.individual_strategy is not None
+        )
+        object.__setattr__(
+            self,
+            "_generate_aggregate",
+            self.per_station_aggregate_strategy is not None,
+        )
 
+
+@functools.lru_cache(maxsize=1)
 def _find_project_root() -> Path:
     """Find project root by looking for marker files.
 
     Searches upward from the config file location for project markers
-    like package.json or .git directory.
+    like package.json or .git directory. The result is cached; call
+    clear_project_root_cache() to force a fresh search.
 
     Returns:
         Path to project root, or falls back to calculated path.
     """
-    import logging
-
-    logger = logging.getLogger(__name__)
-
     current = Path(__file__).parent
 
     # Search up to 5 levels up
     for parent in [current] + list(current.parents)[:5]:
-        # Look for project markers
-        if (parent / "package.json").exists() or (parent / ".git").exists():
+        # Look for project markers, checking the more likely .git first
+        # (.git may be a file in worktrees and submodules)
+        parent_str = os.fspath(parent)
+        if os.path.exists(parent_str + "/.git") or os.path.isfile(
+            parent_str + "/package.json"
+        ):
             logger.debug(f"Project root found at: {parent}")
             return parent
 
@@ -176,10 +280,13 @@ def _find_project_root() -> Path:
     return fallback
 
 
+def clear_project_root_cache() -> None:
+    """Clear the cached project root so the next lookup searches again."""
+    _find_project_root.cache_clear()
+
+
 # Get the directory where this config file is located
 _CONFIG_DIR: Path = Path(__file__).parent
-_PROJECT_ROOT: Path = _find_project_root()
-_DEFAULT_OUTPUT_DIR: Path = _PROJECT_ROOT / "frontend" / "public" / "routes"
 
 
 def _get_output_dir() -> Path:
@@ -191,83 +298,140 @@ def _get_output_dir() -> Path:
     Returns:
         Absolute or relative Path to output directory.
     """
-    env_dir = os.getenv("OUTPUT_DIR")
+    env_dir = _env("OUTPUT_DIR")
     if env_dir:
         path = Path(env_dir)
         # If relative, make it relative to config file
         if not path.is_absolute():
             path = _CONFIG_DIR / path
         return path
-    return _DEFAULT_OUTPUT_DIR
+    return _find_project_root() / "frontend" / "public" / "routes"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ValhallaConfig:
     """Valhalla routing engine configuration."""
 
-    base_url: str = field(
-        default_factory=lambda: os.getenv("VALHALLA_URL", "http://localhost:8002")
-    )
+    base_url: str = field(default_factory=lambda: _env("VALHALLA_URL"))
     timeout_seconds: int = 30
     max_retries: int = 3
     retry_delay_seconds: float = 1.0
     snap_radius_m: int = 100  # Road snapping radius in meters
     min_reachability_nodes: int = 20  # Minimum reachability for location
+    # Route requests in flight at once; match Valhalla's server_threads
+    concurrency: int = 1
+
+    # Endpoint URLs, computed once in __post_init__
+    _route_endpoint: str = field(init=False, repr=False, compare=False)
+    _status_endpoint: str = field(init=False, repr=False, compare=False)
 
     @property
     def route_endpoint(self) -> str:
         """Full URL for route API endpoint."""
-        return f"{self.base_url}/route"
+        return self._route_endpoint
 
     @property
     def status_endpoint(self) -> str:
         """Full URL for status API endpoint."""
-        return f"{self.base_url}/status"
+        return self._status_endpoint
 
     def __post_init__(self):
-        """Validate configuration."""
-        if not self.base_url.startswith(("http://", "https://")):
+        """Validate configuration and precompute endpoint URLs."""
+        if not self.base_url.startswith(_VALHALLA_URL_SCHEMES):
             raise ValueError(f"Invalid Valhalla URL: {self.base_url}")
+        if self.concurrency < 1:
+            raise ValueError(f"Concurrency must be positive: {self.concurrency}")
+
+        self._init_derived()
 
+    def _init_derived(self):
+        """Compute cached fields derived from the init fields."""
+        object.__setattr__(self, "_route_endpoint", f"{self.base_url}/route")
+        object.__setattr__(self, "_status_endpoint", f"{self.base_url}/status")
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class DatabaseConfig:
     """PostgreSQL database configuration."""
 
-    host: str = field(default_factory=lambda: os.getenv("POSTGRES_HOST", "localhost"))
-    port: int = field(default_factory=lambda: int(os.getenv("POSTGRES_PORT", "5432")))
-    database: str = field(
-        default_factory=lambda: os.getenv("POSTGRES_DB", "peloton_db")
-    )
-    user: str = field(default_factory=lambda: os.getenv("POSTGRES_USER", "peloton"))
-    password: str = field(default_factory=lambda: os.getenv("POSTGRES_PASSWORD", ""))
-    schema: str = field(default_factory=lambda: os.getenv("POSTGRES_SCHEMA", "hsl"))
+    host: str = field(default_factory=lambda: _env("POSTGRES_HOST"))
+    port: int = field(default_factory=lambda: int(_env("POSTGRES_PORT")))
+    database: str = field(default_factory=lambda: _env("POSTGRES_DB"))
+    user: str = field(default_factory=lambda: _env("POSTGRES_USER"))
+    password: str = field(default_factory=lambda: _env("POSTGRES_PASSWORD"))
+    schema: str = field(default_factory=lambda: _env("POSTGRES_SCHEMA"))
+
+    # Connection string, built once in __post_init__
+    _connection_string: str = field(init=False, repr=False, compare=False)
 
     @property
     def connection_string(self) -> str:
         """PostgreSQL connection string."""
-        return (
-            f"host={self.host} "
-            f"port={self.port} "
-            f"dbname={self.database} "
-            f"user={self.user} "
-            f"password={self.password}"
-        )
+        return self._connection_string
 
     @classmethod
     def from_env(cls) -> "DatabaseConfig":
         """Create configuration from environment variables."""
-        return cls()
+        _ensure_env_loaded()
+        env = os.environ
+        defaults = _ENV_DEFAULTS
+        return cls(
+            host=env.get("POSTGRES_HOST") or defaults["POSTGRES_HOST"],
+            port=int(env.get("POSTGRES_PORT") or defaults["POSTGRES_PORT"]),
+            database=env.get("POSTGRES_DB") or defaults["POSTGRES_DB"],
+            user=env.get("POSTGRES_USER") or defaults["POSTGRES_USER"],
+            password=env.get("POSTGRES_PASSWORD") or defaults["POSTGRES_PASSWORD"],
+            schema=env.get("POSTGRES_SCHEMA") or defaults["POSTGRES_SCHEMA"],
+        )
 
     def __post_init__(self):
-        """Validate configuration."""
+        """Validate configuration and build the connection string."""
         if not self.password:
             raise ValueError("POSTGRES_PASSWORD must be set in environment")
         if not (1 <= self.port <= 65535):
             raise ValueError(f"Invalid port: {self.port}")
 
+        self._init_derived()
+
+    def _init_derived(self):
+        """Compute cached fields derived from the init fields."""
+        object.__setattr__(
+            self,
+            "_connection_string",
+            f"host={self.host} "
+            f"port={self.port} "
+            f"dbname={self.database} "
+            f"user={self.user} "
+            f"password={self.password}",
+        )
+
 
-@dataclass
+# File suffix appended to ".json" for each supported compression format
+_COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+@functools.lru_cache(maxsize=32)
+def _top_routes_filename(
+    phase: str, coverage_pct: float, compression_format: str = "gzip"
+) -> str:
+    """Filename for the top routes file of a generation phase."""
+    suffix = _COMPRESSION_SUFFIXES[compression_format]
+    if phase == "phase1":
+        return f"top-1000.json{suffix}"
+    # Phase 2+: Use coverage percentage in filename
+    return f"top-{int(coverage_pct)}pct.json{suffix}"
+
+
+def _default_route_cache_path() -> Path:
+    """Route geometry cache file, kept out of the published output directory."""
+    return _CONFIG_DIR.parent / ".route_cache.sqlite"
+
+
+# Substrings expected somewhere in the output directory path
+_OUTPUT_DIR_MARKERS = ("routes", "output", "public")
+
+
+@dataclass(slots=True, frozen=True)
 class OutputConfig:
     """Output file configuration."""
 
@@ -283,11 +447,49 @@ class OutputConfig:
     # Compression settings
     use_compression: bool = True
     compression_level: int = 9  # 1-9, where 9 is max compression
+    # "zstd" needs the optional zstandard package and a zstd-aware client
+    compression_format: Literal["gzip", "zstd"] = "gzip"
+
+    # Processes used to write per-station files (None = CPU count, 1 = serial)
+    write_workers: Optional[int] = None
+
+    # Derived paths, computed once in __post_init__
+    _manifest_path: Path = field(init=False, repr=False, compare=False)
+    _station_dir: Path = field(init=False, repr=False, compare=False)
+    _station_dir_str: str = field(init=False, repr=False, compare=False)
+    _station_ext: str = field(init=False, repr=False, compare=False)
+    _file_ext: str = field(init=False, repr=False, compare=False)
+    _top_routes_paths: dict = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _station_paths: dict = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _base_dir_exists: bool = field(init=False, repr=False, compare=False)
+
+    @property
+    def base_dir_exists(self) -> bool:
+        """Whether base_dir existed when last probed (see refresh_fs_state)."""
+        return self._base_dir_exists
+
+    def refresh_fs_state(self):
+        """Re-probe the filesystem, e.g. after creating the output directory."""
+        object.__setattr__(self, "_base_dir_exists", self.base_dir.exists())
+
+    @property
+    def compression(self) -> Optional[str]:
+        """Compression format for output files, or None when disabled."""
+        return self.compression_format if self.use_compression else None
+
+    @property
+    def file_ext(self) -> str:
+        """Extension for named route files, e.g. ".json.gz"."""
+        return self._file_ext
 
     @property
     def manifest_path(self) -> Path:
         """Full path to manifest file."""
-        return self.base_dir / self.manifest_filename
+        return self._manifest_path
 
     def top_routes_path(
         self, phase: str = "phase1", coverage_pct: float = 80.0
@@ -301,13 +503,14 @@ class OutputConfig:
         Returns:
             Path with appropriate filename for the phase
         """
-        if phase == "phase1":
-            filename = "top-1000.json.gz"
-        else:
-            # Phase 2+: Use coverage percentage in filename
-            coverage_int = int(coverage_pct)
-            filename = f"top-{coverage_int}pct.json.gz"
-        return self.base_dir / filename
+        key = (phase, coverage_pct)
+        path = self._top_routes_paths.get(key)
+        if path is None:
+            path = self.base_dir / _top_routes_filename(
+                phase, coverage_pct, self.compression_format
+            )
+            self._top_routes_paths[key] = path
+        return path
 
     def top_routes_filename(
         self, phase: str = "phase1", coverage_pct: float = 80.0
@@ -321,33 +524,40 @@ class OutputConfig:
         Returns:
             Filename string
         """
-        if phase == "phase1":
-            return "top-1000.json.gz"
-        else:
-            coverage_int = int(coverage_pct)
-            return f"top-{coverage_int}pct.json.gz"
+        return _top_routes_filename(phase, coverage_pct, self.compression_format)
 
     @property
     def station_dir(self) -> Path:
         """Full path to station directory."""
-        return self.base_dir / self.station_subdir
+        return self._station_dir
 
     def station_file_path(self, station_id: str) -> Path:
         """Generate path for a station's route file."""
-        filename = (
-            f"s{station_id}.json.gz" if self.use_compression else f"s{station_id}.json"
-        )
-        return self.station_dir / filename
+        path = self._station_paths.get(station_id)
+        if path is None:
+            path = Path(self._station_dir_str + "s" + station_id + self._station_ext)
+            self._station_paths[station_id] = path
+        return path
 
     def __post_init__(self):
         """Resolve paths to absolute and validate."""
-        # Only resolve if it's a relative path
-        if not self.base_dir.is_absolute():
-            self.base_dir = self.base_dir.resolve()
-
-        # Validate that the path makes sense
-        path_str = str(self.base_dir).lower()
-        if not any(marker in path_str for marker in ["routes", "output", "public"]):
+        if isinstance(self.base_dir, str):
+            object.__setattr__(self, "base_dir", Path(self.base_dir))
+        elif not isinstance(self.base_dir, Path):
+            raise ValueError(f"Invalid output directory: {self.base_dir!r}")
+        if self.compression_format not in _COMPRESSION_SUFFIXES:
+            raise ValueError(f"Invalid compression format: {self.compression_format}")
+
+        self._init_derived()
+
+        # Validate that the path makes sense. Markers usually sit in the last
+        # components, so scan parts from the end instead of lowercasing the
+        # whole path string.
+        if not any(
+            marker in part.lower()
+            for part in reversed(self.base_dir.parts)
+            for marker in _OUTPUT_DIR_MARKERS
+        ):
             warnings.warn(
                 f"Output directory '{self.base_dir}' doesn't contain expected "
                 "markers ('routes', 'output', 'public') - this might indicate "
@@ -356,8 +566,28 @@ class OutputConfig:
                 stacklevel=2,
             )
 
+    def _init_derived(self):
+        """Resolve base_dir and compute cached fields derived from it."""
+        # Only resolve if it's a relative path
+        if not self.base_dir.is_absolute():
+            object.__setattr__(self, "base_dir", self.base_dir.resolve())
+
+        # Precompute derived paths; station_file_path() is called per station
+        station_dir = self.base_dir / self.station_subdir
+        object.__setattr__(
+            self, "_manifest_path", self.base_dir / self.manifest_filename
+        )
+        object.__setattr__(self, "_station_dir", station_dir)
+        object.__setattr__(self, "_station_dir_str", str(station_dir) + os.sep)
+        file_ext = ".json" + _COMPRESSION_SUFFIXES[self.compression_format]
+        object.__setattr__(self, "_file_ext", file_ext)
+        object.__setattr__(
+            self, "_station_ext", file_ext if self.use_compression else ".json"
+        )
+        self.refresh_fs_state()
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GenerationConfig:
     """Pipeline generation configuration (DEPRECATED - use RouteGenerationConfig)."""
 
@@ -409,12 +639,46 @@ class GenerationConfig:
             raise ValueError(f"Phase 1 limit must be positive: {self.phase1_limit}")
 
 
-@dataclass
+def _build_unchecked(cls, **kwargs):
+    """Construct a config dataclass without running __post_init__ validation.
+
+    Only use with values that have already been validated. Fields not given
+    in kwargs fall back to their defaults, and cached fields are filled in by
+    the class's _init_derived() hook when it has one.
+
+    Args:
+        cls: Config dataclass to construct
+        **kwargs: Field values
+
+    Returns:
+        Instance of cls
+    """
+    obj = object.__new__(cls)
+    for f in fields(cls):
+        if f.name in kwargs:
+            value = kwargs[f.name]
+        elif f.default is not MISSING:
+            value = f.default
+        elif f.default_factory is not MISSING:
+            value = f.default_factory()
+        elif f.init:
+            raise TypeError(f"{cls.__name__} missing required field: {f.name}")
+        else:
+            continue  # Set by _init_derived()
+        object.__setattr__(obj, f.name, value)
+
+    init_derived = getattr(obj, "_init_derived", None)
+    if init_derived is not None:
+        init_derived()
+    return obj
+
+
+@dataclass(slots=True, frozen=True)
 class PipelineConfig:
     """Complete pipeline configuration."""
 
     valhalla: ValhallaConfig = field(default_factory=ValhallaConfig)
-    database: DatabaseConfig = field(default_factory=DatabaseConfig)
+    database: DatabaseConfig = field(default_factory=DatabaseConfig.from_env)
     output: OutputConfig = field(default_factory=OutputConfig)
     generation: RouteGenerationConfig = field(
         default_factory=lambda: RouteGenerationConfig(
@@ -461,6 +725,39 @@ class PipelineConfig:
             generation=gen_config,
         )
 
+    @classmethod
+    def from_validated_dict(cls, data: Dict[str, Dict]) -> "PipelineConfig":
+        """
+        Build configuration from a dict of settings, validating it once.
+
+        Each section is built with its regular constructor, so its values are
+        validated here at the boundary. The sections are then assembled
+        without further checks, as every one of them is already valid.
+
+        Args:
+            data: Mapping of section name ("valhalla", "database", "output",
+                  "generation") to that section's field values. Missing
+                  sections use the regular (validated) defaults.
+
+        Returns:
+            PipelineConfig built from the given sections
+
+        Raises:
+            ValueError: If data contains an unknown section, or a section has
+                        unknown fields or invalid values
+        """
+        unknown = set(data) - _PIPELINE_SECTIONS.keys()
+        if unknown:
+            raise ValueError(f"Unknown configuration sections: {sorted(unknown)}")
+
+        sections = {}
+        for name, values in data.items():
+            try:
+                sections[name] = _PIPELINE_SECTIONS[name](**values)
+            except TypeError as e:  # Unknown or missing fields
+                raise ValueError(f"Invalid {name} configuration: {e}") from e
+        return _build_unchecked(cls, **sections)
+
     def validate(self) -> bool:
         """Validate complete configuration."""
         # All validation happens in __post_init__ of sub-configs
@@ -468,39 +765,43 @@ class PipelineConfig:
 
     def summary(self) -> str:
         """Generate configuration summary for logging."""
-        output_exists = "✅ exists" if self.output.base_dir.exists() else "⚠️  not found"
-
-        # Build route selection summary
-        route_summary = []
-        if self.generation.should_generate_global():
-            route_summary.append(f"Global: {self.generation.global_strategy}")
-        if self.generation.should_generate_individual():
-            route_summary.append(f"Individual: {self.generation.individual_strategy}")
-        if self.generation.should_generate_aggregate():
-            route_summary.append(
-                f"Aggregate: {self.generation.per_station_aggregate_strategy}"
-            )
-
-        routes_text = "\n".join(f"  - {s}" for s in route_summary)
-
-        return f"""
-Pipeline Configuration
-======================
-Route Selection:
-{routes_text}
-Min Trips: {self.generation.min_trips_threshold}
-
-Database: {self.database.host}:{self.database.port}/{self.database.database}
-Schema: {self.database.schema}
-
-Valhalla: {self.valhalla.base_url}
-Timeout: {self.valhalla.timeout_seconds}s
-Max Retries: {self.valhalla.max_retries}
-
-Output Directory: {self.output.base_dir} ({output_exists})
-Compression: {self.output.use_compression}
-======================
-        """.strip()
+        output_exists = "✅ exists" if self.output.base_dir_exists else "⚠️  not found"
+        generation = self.generation
+
+        parts = ["Pipeline Configuration", "======================", "Route Selection:"]
+        if generation.should_generate_global():
+            parts.append(f"  - Global: {generation.global_strategy}")
+        if generation.should_generate_individual():
+            parts.append(f"  - Individual: {generation.individual_strategy}")
+        if generation.should_generate_aggregate():
+            parts.append(f"  - Aggregate: {generation.per_station_aggregate_strategy}")
+        parts += [
+            f"Min Trips: {generation.min_trips_threshold}",
+            "",
+            f"Database: {self.database.host}:{self.database.port}"
+            f"/{self.database.database}",
+            f"Schema: {self.database.schema}",
+            "",
+            f"Valhalla: {self.valhalla.base_url}",
+            f"Timeout: {self.valhalla.timeout_seconds}s",
+            f"Max Retries: {self.valhalla.max_retries}",
+            f"Route Cache: {generation.route_cache_path or 'disabled'}",
+            "",
+            f"Output Directory: {self.output.base_dir} ({output_exists})",
+            f"Compression: {self.output.use_compression}",
+            "======================",
+        ]
+
+        return "\n".join(parts)
+
+
+# Sub-config classes of PipelineConfig, by field name
+_PIPELINE_SECTIONS = {
+    "valhalla": ValhallaConfig,
+    "database": DatabaseConfig,
+    "output": OutputConfig,
+    "generation": RouteGenerationConfig,
+}
 
 
 # Example usage and testing
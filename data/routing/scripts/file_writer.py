@@ -4,16 +4,351 @@
 import json
 import gzip
 import logging
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Tuple
 from datetime import datetime, UTC
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 
 from models import RouteGeometry, RouteStatistics
 from config import OutputConfig, RouteSelectionStrategy
+from route_encoders import dumps, encode_route_list, encode_station_payload
+
+try:
+    from isal import igzip, isal_zlib
+except ImportError:  # Optional dependency
+    igzip = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, required for compression_format="zstd"
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
+# Reverse direction of a RouteGeometry, sharing its geometry (see
+# organize_by_station)
+_ReverseEntry = namedtuple(
+    "_ReverseEntry",
+    "route_key departure_station_id return_station_id polyline distance_km "
+    "duration_minutes direction distance_km_rounded duration_min_rounded",
+)
+
+# Fetch all serialized RouteGeometry fields (pre-rounded) in a single C-level call
+_ROUTE_FIELDS = attrgetter(
+    "route_key",
+    "departure_station_id",
+    "return_station_id",
+    "polyline",
+    "distance_km_rounded",
+    "duration_min_rounded",
+)
+_STATION_ENTRY_FIELDS = attrgetter(
+    "route_key",
+    "return_station_id",
+    "direction",
+    "polyline",
+    "distance_km_rounded",
+    "duration_min_rounded",
+)
+
+
+def _station_sort_key(station_id: str) -> Tuple[int, str]:
+    """Sort key ordering zero-padded numeric station IDs numerically."""
+    return len(station_id), station_id
+
+
+def _gzip_compress(payload: bytes, compression_level: int) -> bytes:
+    """
+    Gzip-compress bytes, using ISA-L's SIMD deflate when available.
+
+    ISA-L only supports levels 0-3, so higher levels always use zlib; the
+    output size for a given level doesn't depend on whether isal is installed.
+
+    Args:
+        payload: Uncompressed bytes
+        compression_level: Gzip compression level (1-9)
+    """
+    if igzip is not None and compression_level <= isal_zlib.ISAL_BEST_COMPRESSION:
+        return igzip.compress(payload, compresslevel=compression_level, mtime=0)
+    return gzip.compress(payload, compresslevel=compression_level, mtime=0)
+
+
+def _zstd_compress(payload: bytes, compression_level: int) -> bytes:
+    """
+    Zstandard-compress bytes.
+
+    threads=-1 lets zstd split large payloads (e.g. the global routes file)
+    across cores; small station payloads stay on a single thread.
+
+    Args:
+        payload: Uncompressed bytes
+        compression_level: Zstandard compression level
+    """
+    cctx = zstandard.ZstdCompressor(level=compression_level, threads=-1)
+    return cctx.compress(payload)
+
+
+# Compression format -> (file suffix, compress function)
+_COMPRESSORS = {
+    "gzip": (".gz", _gzip_compress),
+    "zstd": (".zst", _zstd_compress),
+}
+
+
+def _zstd_decompress(payload: bytes) -> bytes:
+    """Decompress a single zstd frame written by _zstd_compress."""
+    return zstandard.ZstdDecompressor().decompress(payload)
+
+
+# Compression format -> decompress function, for reading output files back
+_DECOMPRESSORS = {
+    "gzip": gzip.decompress,
+    "zstd": _zstd_decompress,
+}
+
+
+def read_payload(filepath: Path, compression: Optional[str]) -> bytes:
+    """
+    Read an output file back as encoded JSON bytes.
+
+    Args:
+        filepath: File written with the given compression
+        compression: "gzip", "zstd", or None for uncompressed files
+
+    Returns:
+        Uncompressed JSON bytes
+
+    Raises:
+        ImportError: If the file is zstd-compressed and zstandard is missing
+    """
+    payload = filepath.read_bytes()
+    if not compression:
+        return payload
+    if compression == "zstd" and zstandard is None:
+        raise ImportError("Reading zstd output requires the zstandard package")
+    return _DECOMPRESSORS[compression](payload)
+
+
+def _write_payload(
+    filepath: Path, payload: bytes, compression: Optional[str], compression_level: int
+) -> int:
+    """
+    Write encoded JSON bytes to a file, compressed if requested.
+
+    Module-level so it can also run in worker processes.
+
+    Args:
+        filepath: Output file path (the format's suffix is appended if missing)
+        payload: Encoded JSON bytes
+        compression: "gzip", "zstd", or None for uncompressed output
+        compression_level: Compression level
+
+    Returns:
+        Number of bytes written
+    """
+    if compression:
+        suffix, compress = _COMPRESSORS[compression]
+        if not str(filepath).endswith(suffix):
+            filepath = Path(str(filepath) + suffix)
+
+        # Compress in one shot; gzip output uses mtime=0 to stay deterministic
+        payload = compress(payload, compression_level)
+
+    # The payload is already fully in memory, so write it straight to the
+    # descriptor instead of going through a buffered file object
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+    return len(payload)
+
+
+def _write_json_file(
+    filepath: Path, data: Dict, compression: Optional[str], compression_level: int
+) -> int:
+    """
+    Write JSON data to a file, compressed if requested.
+
+    Compressed files use compact JSON; uncompressed files are indented.
+
+    Args:
+        filepath: Output file path (the format's suffix is appended if missing)
+        data: Data to write as JSON
+        compression: "gzip", "zstd", or None for uncompressed output
+        compression_level: Compression level
+
+    Returns:
+        Number of bytes written
+    """
+    payload = dumps(data, indent=compression is None)
+    return _write_payload(filepath, payload, compression, compression_level)
+
+
+def _compress_and_write_station(task: Tuple[Path, bytes, Optional[str], int]) -> int:
+    """Worker entry point: write one station file from a pickled task tuple."""
+    return _write_payload(*task)
+
+
+def _encode_and_write_station(
+    task: Tuple[str, List[Tuple], Path, Optional[str], int]
+) -> int:
+    """
+    Worker entry point: encode and write one station file.
+
+    Runs in a worker process, so the JSON encoding happens outside the
+    parent's GIL. The fragment cache is per call: a route's forward and
+    reverse entries are in different station files, which may be encoded by
+    different processes.
+
+    Args:
+        task: (station_id, entries, filepath, compression, compression_level)
+
+    Returns:
+        Number of bytes written
+    """
+    station_id, entries, filepath, compression, compression_level = task
+    payload = encode_station_payload(station_id, entries, {})
+    return _write_payload(filepath, payload, compression, compression_level)
+
+
+class StationFileStream:
+    """
+    Writes per-station files while route geometries are still arriving.
+
+    Routes are added one at a time, in the order they are generated. A
+    station's file is written as soon as every route in its per_station_filter
+    entry has arrived; the rest (stations without a filter entry, or with
+    routes that failed to generate) are written by close(). The files are the
+    same as write_routes_by_station() writes for the same routes.
+
+    Create through RouteFileWriter.open_station_stream() and use as a context
+    manager, calling close() to finish writing.
+    """
+
+    def __init__(
+        self,
+        config: OutputConfig,
+        bidirectional_map: Dict[str, RouteStatistics],
+        per_station_filter: Optional[Dict[str, List[RouteStatistics]]],
+    ):
+        self._station_file_path = config.station_file_path
+        self._compression = config.compression
+        self._compression_level = config.compression_level
+        # route_key -> encoded {"polyline", "distance_km", "duration_min"}
+        # object, shared by the forward and reverse entries of a route. Scoped
+        # to this stream, so a later write never sees a stale geometry
+        self._fragment_cache: Dict[str, bytes] = {}
+        self._get_reverse_stats = bidirectional_map.get
+
+        # Entries are kept as flat row tuples from one attrgetter call.
+        # Per-station column lists were measured slightly slower in CPython,
+        # since every route then needs six appends instead of one.
+        self._entries: Dict[str, List[Tuple]] = defaultdict(list)
+        # station_id -> route keys written to its file / still to arrive
+        self._allowed: Dict[str, frozenset] = {
+            station_id: frozenset(rs.route_key for rs in routes)
+            for station_id, routes in (per_station_filter or {}).items()
+        }
+        self._pending = {
+            station_id: set(keys) for station_id, keys in self._allowed.items()
+        }
+        self._written: set = set()
+        self._created_files: List[Tuple[str, str]] = []
+
+        # Threads rather than processes: route generation threads are still
+        # running (forking then is unsafe), and the compressors release the GIL
+        workers = config.write_workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(workers) if workers > 1 else None
+        self._futures: List[Future] = []
+        self._total_size = 0
+
+    def __enter__(self) -> "StationFileStream":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=exc_type is not None)
+
+    def add(self, route: RouteGeometry):
+        """Add a generated route (and its reverse direction, if selected)."""
+        entry = _STATION_ENTRY_FIELDS(route)
+        self._add_entry(route.departure_station_id, entry)
+
+        # Add reverse direction reusing the same geometry
+        reverse_stats = self._get_reverse_stats(entry[0])
+        if reverse_stats is not None:
+            key, _, _, encoded, distance_km, duration_min = entry
+            self._add_entry(
+                reverse_stats.departure_station_id,
+                (
+                    key,
+                    reverse_stats.return_station_id,
+                    "reverse" if reverse_stats.is_reversed else "forward",
+                    encoded,
+                    distance_km,
+                    duration_min,
+                ),
+            )
+
+    def _add_entry(self, station_id: str, entry: Tuple):
+        if station_id in self._written:
+            return  # All of its filtered routes have arrived, so this isn't one
+
+        # Every station with routes gets a file, even if all are filtered out
+        entries = self._entries[station_id]
+        allowed = self._allowed.get(station_id)
+        if allowed is None:
+            entries.append(entry)
+        elif entry[0] in allowed:
+            entries.append(entry)
+            pending = self._pending[station_id]
+            pending.discard(entry[0])
+            if not pending:
+                self._write(station_id)
+
+    def _write(self, station_id: str):
+        """Encode a station's file and hand it to the writer threads."""
+        self._written.add(station_id)
+        entries = self._entries.pop(station_id)
+        filepath = self._station_file_path(station_id)
+        payload = encode_station_payload(station_id, entries, self._fragment_cache)
+        task = (filepath, payload, self._compression, self._compression_level)
+        if self._executor is not None:
+            self._futures.append(
+                self._executor.submit(_compress_and_write_station, task)
+            )
+        else:
+            self._total_size += _compress_and_write_station(task)
+        self._created_files.append((station_id, filepath.name))
+
+    def close(self) -> List[str]:
+        """
+        Write the remaining station files and wait for all writes to finish.
+
+        Returns:
+            List of created filenames, ordered by station ID
+        """
+        for station_id in sorted(self._entries, key=_station_sort_key):
+            self._write(station_id)
+
+        total_size = self._total_size + sum(f.result() for f in self._futures)
+        self._created_files.sort(key=lambda item: _station_sort_key(item[0]))
+        created_files = [filename for _, filename in self._created_files]
+
+        logger.info(
+            f"Wrote {len(created_files)} station files "
+            f"(total: {total_size:,} bytes)"
+        )
+
+        return created_files
+
 
 class RouteFileWriter:
     """Writes route geometries to JSON files with compression."""
@@ -24,7 +359,15 @@ class RouteFileWriter:
 
         Args:
             output_config: Output configuration
+
+        Raises:
+            ImportError: If zstd compression is configured without zstandard
         """
+        if output_config.compression == "zstd" and zstandard is None:
+            raise ImportError(
+                "compression_format='zstd' requires the zstandard package"
+            )
+
         self.config = output_config
 
     def setup_directories(self):
@@ -37,16 +380,20 @@ class RouteFileWriter:
         self.config.station_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"Created station directory: {self.config.station_dir}")
 
-    def write_manifest(self, metadata: Dict, station_files: List[str]):
+        self.config.refresh_fs_state()
+
+    def write_manifest(self, metadata: Dict, station_files: Iterable[str]):
         """
         Write manifest file with generation metadata.
 
         Args:
             metadata: Generation metadata (phase, timestamp, counts, etc.)
-            station_files: List of station file names
+            station_files: Station file names, in any order
         """
         phase = metadata.get("phase", "phase1")
         coverage_pct = metadata.get("coverage_pct", 80.0)
+        # One sorted copy, used for both the file list and the count
+        files = sorted(station_files)
 
         manifest = {
             "generated_at": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
@@ -55,7 +402,7 @@ class RouteFileWriter:
             "statistics": {
                 "total_routes": metadata.get("total_routes", 0),
                 "unique_routes": metadata.get("unique_routes", 0),
-                "stations_count": len(station_files),
+                "stations_count": len(files),
                 "generation_time_seconds": metadata.get("generation_time", 0),
                 "success_rate_pct": metadata.get("success_rate", 0),
             },
@@ -63,18 +410,17 @@ class RouteFileWriter:
                 "top_routes": self.config.top_routes_filename(
                     phase=phase, coverage_pct=coverage_pct
                 ),
-                "station_files": sorted(station_files),
+                "station_files": files,
             },
             "format": {
                 "encoding": "polyline",
                 "precision": 6,
-                "compression": "gzip" if self.config.use_compression else "none",
+                "compression": self.config.compression or "none",
             },
         }
 
         manifest_path = self.config.manifest_path
-        with open(manifest_path, "w") as f:
-            json.dump(manifest, f, indent=2)
+        _write_payload(manifest_path, dumps(manifest, indent=True), None, 0)
 
         logger.info(f"Wrote manifest: {manifest_path}")
 
@@ -96,24 +442,11 @@ class RouteFileWriter:
 
         # Convert routes to JSON format
         data = {
-            "routes": [
-                {
-                    "route_key": route.route_key,
-                    "from": route.departure_station_id,
-                    "to": route.return_station_id,
-                    "polyline": route.polyline,
-                    "distance_km": round(route.distance_km, 2),
-                    "duration_min": round(route.duration_minutes, 1),
-                    "bidirectional": True,
-                }
-                for route in routes
-            ],
+            "routes": encode_route_list(map(_ROUTE_FIELDS, routes)),
             "count": len(routes),
         }
 
-        self._write_gzipped_json(filepath, data)
-
-        file_size = filepath.stat().st_size
+        file_size = self._write_gzipped_json(filepath, data)
         logger.info(
             f"Wrote {len(routes)} popular routes to {filepath.name} "
             f"({file_size:,} bytes)"
@@ -137,15 +470,15 @@ class RouteFileWriter:
         # Determine filename based on strategy
         from config import RouteSelectionType
 
-        if strategy.selection_type == RouteSelectionType.TOP_N:
+        if strategy.selection_type is RouteSelectionType.TOP_N:
             assert strategy.top_n is not None, "top_n must be set for TOP_N strategy"
-            filename = f"top-{strategy.top_n}.json.gz"
+            filename = f"top-{strategy.top_n}{self.config.file_ext}"
         else:  # PERCENTAGE
             assert (
                 strategy.coverage_percentage is not None
             ), "coverage_percentage must be set for PERCENTAGE strategy"
             pct_int = int(strategy.coverage_percentage)
-            filename = f"top-{pct_int}pct.json.gz"
+            filename = f"top-{pct_int}pct{self.config.file_ext}"
 
         filepath = self.config.base_dir / filename
 
@@ -155,28 +488,15 @@ class RouteFileWriter:
                 "type": strategy.selection_type.value,
                 "value": (
                     strategy.top_n
-                    if strategy.selection_type.value == "top_n"
+                    if strategy.selection_type is RouteSelectionType.TOP_N
                     else strategy.coverage_percentage
                 ),
             },
-            "routes": [
-                {
-                    "route_key": route.route_key,
-                    "from": route.departure_station_id,
-                    "to": route.return_station_id,
-                    "polyline": route.polyline,
-                    "distance_km": round(route.distance_km, 2),
-                    "duration_min": round(route.duration_minutes, 1),
-                    "bidirectional": True,
-                }
-                for route in routes
-            ],
+            "routes": encode_route_list(map(_ROUTE_FIELDS, routes)),
             "count": len(routes),
         }
 
-        self._write_gzipped_json(filepath, data)
-
-        file_size = filepath.stat().st_size
+        file_size = self._write_gzipped_json(filepath, data)
         logger.info(
             f"Wrote {len(routes)} global routes to {filepath.name} "
             f"({file_size:,} bytes)"
@@ -204,15 +524,15 @@ class RouteFileWriter:
         # Determine filename based on strategy
         from config import RouteSelectionType
 
-        if strategy.selection_type == RouteSelectionType.TOP_N:
+        if strategy.selection_type is RouteSelectionType.TOP_N:
             assert strategy.top_n is not None, "top_n must be set for TOP_N strategy"
-            filename = f"per-station-top-{strategy.top_n}.json.gz"
+            filename = f"per-station-top-{strategy.top_n}{self.config.file_ext}"
         else:  # PERCENTAGE
             assert (
                 strategy.coverage_percentage is not None
             ), "coverage_percentage must be set for PERCENTAGE strategy"
             pct_int = int(strategy.coverage_percentage)
-            filename = f"per-station-{pct_int}pct.json.gz"
+            filename = f"per-station-{pct_int}pct{self.config.file_ext}"
 
         filepath = self.config.base_dir / filename
 
@@ -225,8 +545,7 @@ class RouteFileWriter:
             station_routes_geom = []
 
             for route_stat in station_routes_stats:
-                # Create route key
-                key = f"{min(route_stat.departure_station_id, route_stat.return_station_id)}-{max(route_stat.departure_station_id, route_stat.return_station_id)}"
+                key = route_stat.route_key
 
                 if key in route_lookup:
                     route = route_lookup[key]
@@ -234,8 +553,8 @@ class RouteFileWriter:
                         {
                             "to": route_stat.return_station_id,
                             "polyline": route.polyline,
-                            "distance_km": round(route.distance_km, 2),
-                            "duration_min": round(route.duration_minutes, 1),
+                            "distance_km": route.distance_km_rounded,
+                            "duration_min": route.duration_min_rounded,
                             "trip_count": route_stat.trip_count,
                             "bidirectional": True,
                         }
@@ -256,7 +575,7 @@ class RouteFileWriter:
                 "type": strategy.selection_type.value,
                 "value": (
                     strategy.top_n
-                    if strategy.selection_type.value == "top_n"
+                    if strategy.selection_type is RouteSelectionType.TOP_N
                     else strategy.coverage_percentage
                 ),
             },
@@ -265,9 +584,7 @@ class RouteFileWriter:
             "total_routes": sum(s["count"] for s in stations_data),
         }
 
-        self._write_gzipped_json(filepath, data)
-
-        file_size = filepath.stat().st_size
+        file_size = self._write_gzipped_json(filepath, data)
         logger.info(
             f"Wrote {len(stations_data)} stations with aggregate routes to {filepath.name} "
             f"({file_size:,} bytes)"
@@ -288,94 +605,150 @@ class RouteFileWriter:
         Routes may be in "forward" or "reverse" direction based on canonical key.
 
         Args:
-            station_routes: Dict mapping station_id to list of ALL available routes
+            station_routes: Dict mapping station_id to list of ALL available routes,
+                           written in iteration order (see organize_by_station)
+            bidirectional_map: Dict mapping route_key to reverse route statistics
+            per_station_filter: Optional dict of station_id -> routes to include
+                               If provided, only these routes are written per station
+
+        Returns:
+            List of created filenames
+        """
+        return self._write_station_entries(
+            (
+                (station_id, map(_STATION_ENTRY_FIELDS, routes))
+                for station_id, routes in station_routes.items()
+            ),
+            per_station_filter,
+        )
+
+    def write_routes_by_station(
+        self,
+        routes: List[RouteGeometry],
+        bidirectional_map: Dict[str, RouteStatistics],
+        per_station_filter: Optional[Dict[str, List[RouteStatistics]]] = None,
+    ) -> List[str]:
+        """
+        Organize routes by station and write per-station files in one pass.
+
+        Same output as write_station_routes(organize_by_station(...)), but
+        reverse entries are taken straight from the forward geometry instead
+        of building an intermediate RouteGeometry per reverse route.
+
+        Args:
+            routes: List of all route geometries (unique only)
             bidirectional_map: Dict mapping route_key to reverse route statistics
             per_station_filter: Optional dict of station_id -> routes to include
                                If provided, only these routes are written per station
 
+        Returns:
+            List of created filenames
+        """
+        with self.open_station_stream(bidirectional_map, per_station_filter) as stream:
+            for route in routes:
+                stream.add(route)
+            return stream.close()
+
+    def open_station_stream(
+        self,
+        bidirectional_map: Dict[str, RouteStatistics],
+        per_station_filter: Optional[Dict[str, List[RouteStatistics]]] = None,
+    ) -> StationFileStream:
+        """
+        Start writing per-station files from routes added one at a time.
+
+        Args:
+            bidirectional_map: Dict mapping route_key to reverse route statistics
+            per_station_filter: Optional dict of station_id -> routes to include
+
+        Returns:
+            StationFileStream; add() each route, then close() it
+        """
+        return StationFileStream(self.config, bidirectional_map, per_station_filter)
+
+    def _write_station_entries(
+        self,
+        station_entries: Iterable[Tuple[str, Iterable[Tuple]]],
+        per_station_filter: Optional[Dict[str, List[RouteStatistics]]],
+    ) -> List[str]:
+        """
+        Encode and write one file per station.
+
+        Args:
+            station_entries: (station_id, entries) pairs in write order, where
+                            each entry is a _STATION_ENTRY_FIELDS tuple
+            per_station_filter: Optional dict of station_id -> routes to include
+
         Returns:
             List of created filenames
         """
         created_files = []
+        tasks = []
+
+        # Hoist attribute lookups out of the per-station and per-route loops
+        station_file_path = self.config.station_file_path
+        compression = self.config.compression
+        compression_level = self.config.compression_level
 
-        for station_id, all_routes in sorted(station_routes.items()):
-            filepath = self.config.station_file_path(station_id)
+        for station_id, entries in station_entries:
+            filepath = station_file_path(station_id)
 
             # Filter routes if per_station_filter provided
             if per_station_filter and station_id in per_station_filter:
                 # Get allowed route keys for this station
-                allowed_keys = set()
-                for route_stat in per_station_filter[station_id]:
-                    # Create route key
-                    key = f"{min(route_stat.departure_station_id, route_stat.return_station_id)}-{max(route_stat.departure_station_id, route_stat.return_station_id)}"
-                    allowed_keys.add(key)
+                allowed_keys = {rs.route_key for rs in per_station_filter[station_id]}
 
                 # Filter routes
-                routes = [r for r in all_routes if r.route_key in allowed_keys]
-            else:
-                routes = all_routes
+                entries = [e for e in entries if e[0] in allowed_keys]
 
-            # Convert routes to JSON format with direction info
-            route_entries = []
-            for route in routes:
-                # Determine if this is forward or reverse direction
-                is_reverse = route.departure_station_id != min(
-                    route.departure_station_id, route.return_station_id
-                )
-
-                entry = {
-                    "to": route.return_station_id,
-                    "polyline": route.polyline,
-                    "direction": "reverse" if is_reverse else "forward",
-                    "bidirectional": True,
-                    "distance_km": round(route.distance_km, 2),
-                    "duration_min": round(route.duration_minutes, 1),
-                }
-                route_entries.append(entry)
-
-            data = {
-                "station_id": station_id,
-                "routes": route_entries,
-                "count": len(route_entries),
-            }
-
-            self._write_gzipped_json(filepath, data)
+            tasks.append(
+                (station_id, list(entries), filepath, compression, compression_level)
+            )
             created_files.append(filepath.name)
 
-        total_size = sum(
-            self.config.station_file_path(station_id).stat().st_size
-            for station_id in station_routes
-        )
+        # Encoding and compressing is CPU-bound and independent per station,
+        # so spread it across processes when there is more than one file
+        workers = self.config.write_workers or os.cpu_count() or 1
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                total_size = sum(
+                    executor.map(_encode_and_write_station, tasks, chunksize=16)
+                )
+        else:
+            # In-process, forward and reverse entries share encoded fragments
+            # (for this call only; geometries may change between writes)
+            fragment_cache: Dict[str, bytes] = {}
+            total_size = 0
+            for station_id, entries, filepath, _, _ in tasks:
+                payload = encode_station_payload(station_id, entries, fragment_cache)
+                total_size += _write_payload(
+                    filepath, payload, compression, compression_level
+                )
 
         logger.info(
-            f"Wrote {len(station_routes)} station files "
+            f"Wrote {len(created_files)} station files "
             f"(total: {total_size:,} bytes)"
         )
 
         return created_files
 
-    def _write_gzipped_json(self, filepath: Path, data: Dict):
+    def _write_gzipped_json(self, filepath: Path, data: Dict) -> int:
         """
-        Write JSON data with gzip compression.
+        Write JSON data with the configured compression.
 
         Args:
             filepath: Output file path
             data: Data to write as JSON
+
+        Returns:
+            Number of bytes written
         """
-        if self.config.use_compression and not str(filepath).endswith(".gz"):
-            filepath = Path(str(filepath) + ".gz")
-
-        if self.config.use_compression:
-            with gzip.open(
-                filepath,
-                "wt",
-                encoding="utf-8",
-                compresslevel=self.config.compression_level,
-            ) as f:
-                json.dump(data, f, separators=(",", ":"))
-        else:
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+        return _write_json_file(
+            filepath,
+            data,
+            self.config.compression,
+            self.config.compression_level,
+        )
 
     def organize_by_station(
         self, routes: List[RouteGeometry], bidirectional_map: Dict[str, RouteStatistics]
@@ -385,14 +758,15 @@ class RouteFileWriter:
 
         Creates a dictionary where each station has a list of routes
         departing from it. Handles bidirectional routes by including
-        both directions.
+        both directions; reverse directions are _ReverseEntry tuples
+        with the same attributes as RouteGeometry.
 
         Args:
             routes: List of all route geometries (unique only)
             bidirectional_map: Dict mapping route_key to reverse route
 
         Returns:
-            Dict mapping station_id to list of routes
+            Dict mapping station_id to list of routes, ordered by station ID
         """
         station_routes = defaultdict(list)
 
@@ -400,18 +774,23 @@ class RouteFileWriter:
             # Add forward direction
             station_routes[route.departure_station_id].append(route)
 
-            # Check if there's a reverse direction
-            if route.route_key in bidirectional_map:
-                reverse_route_stats = bidirectional_map[route.route_key]
-
-                # Create reverse route geometry using same polyline
-                reverse_route = RouteGeometry(
+            # Check if there's a reverse direction (one lookup per route)
+            reverse_route_stats = bidirectional_map.get(route.route_key)
+            if reverse_route_stats is not None:
+                # Create reverse entry using same polyline; a plain tuple
+                # skips RouteGeometry's __init__ and validation
+                reverse_route = _ReverseEntry(
                     route_key=route.route_key,  # Same canonical key
                     departure_station_id=reverse_route_stats.departure_station_id,
                     return_station_id=reverse_route_stats.return_station_id,
                     polyline=route.polyline,  # Same geometry
                     distance_km=route.distance_km,
                     duration_minutes=route.duration_minutes,
+                    direction=(
+                        "reverse" if reverse_route_stats.is_reversed else "forward"
+                    ),
+                    distance_km_rounded=route.distance_km_rounded,
+                    duration_min_rounded=route.duration_min_rounded,
                 )
 
                 station_routes[reverse_route.departure_station_id].append(reverse_route)
@@ -421,7 +800,12 @@ class RouteFileWriter:
             f"station files"
         )
 
-        return dict(station_routes)
+        # Order stations once here, numerically for zero-padded IDs, so the
+        # writer can iterate the dict as-is
+        return {
+            station_id: station_routes[station_id]
+            for station_id in sorted(station_routes, key=_station_sort_key)
+        }
 
 
 # Example usage and testing
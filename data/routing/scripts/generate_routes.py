@@ -37,7 +37,19 @@ import sys
 import logging
 import time
 import argparse
-from typing import List, Dict
+from contextlib import nullcontext
+from heapq import nsmallest
+from itertools import chain
+from typing import (
+    TYPE_CHECKING,
+    ContextManager,
+    Iterator,
+    List,
+    Dict,
+    FrozenSet,
+    Optional,
+    Tuple,
+)
 
 from config import (
     PipelineConfig,
@@ -50,12 +62,23 @@ from config import (
     GenerationConfig,
 )
 from models import RouteStatistics, StationCoordinate, RouteGeometry
-from route_analyzer import RouteAnalyzer
-from route_generator import RouteGenerator
-from file_writer import RouteFileWriter
+
+# The pipeline stages pull in the database driver and HTTP client; they're
+# imported when a pipeline is created so --help doesn't have to load them.
+if TYPE_CHECKING:
+    from route_cache import QueryResultCache, RouteCache
+    from file_writer import StationFileStream
 
 logger = logging.getLogger(__name__)
 
+# Newly generated geometries written to the route cache per transaction
+_CACHE_FLUSH_SIZE = 500
+
+
+def _strategy_str(strategy: Optional[RouteSelectionStrategy]) -> Optional[str]:
+    """Manifest value for an optional selection strategy."""
+    return str(strategy) if strategy is not None else None
+
 
 class RoutePipeline:
     """Main pipeline orchestrator for route generation."""
@@ -67,8 +90,28 @@ class RoutePipeline:
         Args:
             config: Complete pipeline configuration
         """
+        from route_analyzer import RouteAnalyzer
+        from route_generator import RouteGenerator
+        from route_cache import QueryResultCache, RouteCache
+        from file_writer import RouteFileWriter
+
         self.config = config
-        self.analyzer = RouteAnalyzer(config.database)
+        # Route geometries and the route aggregation queries are cached in
+        # the same file
+        self.cache: Optional["RouteCache"] = None
+        self.query_cache: Optional["QueryResultCache"] = None
+        if config.generation.route_cache_path is not None:
+            self.cache = RouteCache(
+                config.generation.route_cache_path,
+                costing=config.generation.costing,
+                bicycle_type=config.generation.bicycle_type,
+            )
+            self.query_cache = QueryResultCache(config.generation.route_cache_path)
+            if config.generation.clear_route_cache:
+                self.cache.clear()
+                self.query_cache.clear()
+
+        self.analyzer = RouteAnalyzer(config.database, query_cache=self.query_cache)
         # Create compatibility GenerationConfig for RouteGenerator
         compat_gen_config = GenerationConfig(
             phase="phase1",  # Dummy value, not used
@@ -84,6 +127,8 @@ class RoutePipeline:
         self.bidirectional_map: Dict[str, RouteStatistics] = {}
         self.per_station_routes: Dict[str, List[RouteStatistics]] = {}
         self.global_routes: List[RouteStatistics] = []
+        self.global_route_keys: FrozenSet[str] = frozenset()
+        self.global_generated: List[RouteGeometry] = []
         self.aggregate_routes: Dict[str, List[RouteStatistics]] = {}
 
     def run(self):
@@ -96,9 +141,8 @@ class RoutePipeline:
         3. Analyze route statistics
         4. Fetch station coordinates
         5. Generate route geometries
-        6. Organize routes by station
-        7. Write output files
-        8. Report statistics
+        6. Write output files
+        7. Report statistics
         """
         start_time = time.time()
 
@@ -106,50 +150,53 @@ class RoutePipeline:
             logger.info("=" * 60)
             logger.info("Route Generation Pipeline")
             logger.info("=" * 60)
-            logger.info(f"\n{self.config.summary()}\n")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"\n{self.config.summary()}\n")
 
             # Step 1: Connect to database
-            logger.info("Step 1/8: Connecting to database...")
+            logger.info("Step 1/7: Connecting to database...")
             self.analyzer.connect()
+            if self.config.generation.ensure_route_index:
+                self.analyzer.ensure_route_index()
 
             # Get database statistics
             db_stats = self.analyzer.get_statistics_summary()
             logger.info(f"Database contains {db_stats['total_trips']:,} trips")
 
-            # Step 2: Test Valhalla connection
-            logger.info("\nStep 2/8: Testing Valhalla connection...")
-            if not self.generator.test_connection():
-                raise RuntimeError("Valhalla is not available")
+            # Step 2: Test Valhalla connection. With the route cache it isn't
+            # needed at all if every route is cached, so test it only once
+            # there are routes to request.
+            logger.info("\nStep 2/7: Testing Valhalla connection...")
+            if self.cache is None:
+                self._check_valhalla()
+            else:
+                logger.info("Deferred until route cache misses are known")
 
             # Step 3: Analyze and select routes
-            logger.info("\nStep 3/8: Analyzing route statistics...")
+            logger.info("\nStep 3/7: Analyzing route statistics...")
             routes_to_generate, self.per_station_routes = self._select_routes()
             logger.info(f"Selected {len(routes_to_generate)} routes to generate")
 
             # Step 4: Fetch station coordinates
-            logger.info("\nStep 4/8: Fetching station coordinates...")
+            logger.info("\nStep 4/7: Fetching station coordinates...")
             station_coords = self._fetch_station_coordinates(routes_to_generate)
             logger.info(f"Fetched coordinates for {len(station_coords)} stations")
 
-            # Step 5: Generate route geometries
-            logger.info("\nStep 5/8: Generating route geometries...")
-            generated_routes = self._generate_geometries(
-                routes_to_generate, station_coords
-            )
-            logger.info(f"Generated {len(generated_routes)} route geometries")
-
-            # Step 6: Organize routes by station
-            logger.info("\nStep 6/8: Organizing routes by station...")
-            station_routes = self.writer.organize_by_station(
-                generated_routes, self.bidirectional_map
-            )
+            # Per-station files are written while geometries are generated
+            with self._open_station_stream() as station_stream:
+                # Step 5: Generate route geometries
+                logger.info("\nStep 5/7: Generating route geometries...")
+                generated_routes = self._generate_geometries(
+                    routes_to_generate, station_coords, station_stream
+                )
+                logger.info(f"Generated {len(generated_routes)} route geometries")
 
-            # Step 7: Write output files
-            logger.info("\nStep 7/8: Writing output files...")
-            self._write_output_files(generated_routes, station_routes)
+                # Step 6: Write output files
+                logger.info("\nStep 6/7: Writing output files...")
+                self._write_output_files(generated_routes, station_stream)
 
-            # Step 8: Report statistics
-            logger.info("\nStep 8/8: Generating statistics report...")
+            # Step 7: Report statistics
+            logger.info("\nStep 7/7: Generating statistics report...")
             elapsed = time.time() - start_time
             self._report_statistics(
                 len(routes_to_generate), len(generated_routes), elapsed
@@ -167,6 +214,15 @@ class RoutePipeline:
             # Cleanup
             if self.analyzer.conn:
                 self.analyzer.close()
+            if self.cache is not None:
+                self.cache.close()
+            if self.query_cache is not None:
+                self.query_cache.close()
+
+    def _check_valhalla(self):
+        """Raise RuntimeError unless Valhalla is up."""
+        if not self.generator.test_connection():
+            raise RuntimeError("Valhalla is not available")
 
     def _select_routes(
         self,
@@ -198,6 +254,7 @@ class RoutePipeline:
                 gen_config.global_strategy, scope="global"
             )
             self.global_routes = global_routes
+            self.global_route_keys = frozenset(r.route_key for r in global_routes)
 
             for route in global_routes:
                 key = (route.departure_station_id, route.return_station_id)
@@ -206,6 +263,7 @@ class RoutePipeline:
             logger.info(f"  Selected {len(global_routes)} global routes")
         else:
             self.global_routes = []
+            self.global_route_keys = frozenset()
             logger.info("Global routes disabled")
 
         # Get individual station routes if enabled
@@ -284,14 +342,14 @@ class RoutePipeline:
         Returns:
             List of RouteStatistics
         """
-        if strategy.selection_type == RouteSelectionType.TOP_N:
+        if strategy.selection_type is RouteSelectionType.TOP_N:
             assert (
                 strategy.top_n is not None
             ), "top_n should not be None for TOP_N strategy"
             logger.info(f"  Strategy: Top {strategy.top_n} routes ({scope})")
             return self.analyzer.get_top_n_routes(n=strategy.top_n)
 
-        elif strategy.selection_type == RouteSelectionType.PERCENTAGE:
+        elif strategy.selection_type is RouteSelectionType.PERCENTAGE:
             assert (
                 strategy.coverage_percentage is not None
             ), "coverage_percentage should not be None for PERCENTAGE strategy"
@@ -317,14 +375,14 @@ class RoutePipeline:
         Returns:
             Dict mapping station_id to list of RouteStatistics
         """
-        if strategy.selection_type == RouteSelectionType.TOP_N:
+        if strategy.selection_type is RouteSelectionType.TOP_N:
             assert (
                 strategy.top_n is not None
             ), "top_n should not be None for TOP_N strategy"
             logger.info(f"  Strategy: Top {strategy.top_n} routes per station")
             return self.analyzer.get_routes_by_station_top_n(strategy.top_n)
 
-        elif strategy.selection_type == RouteSelectionType.PERCENTAGE:
+        elif strategy.selection_type is RouteSelectionType.PERCENTAGE:
             assert (
                 strategy.coverage_percentage is not None
             ), "coverage_percentage should not be None for PERCENTAGE strategy"
@@ -351,19 +409,34 @@ class RoutePipeline:
             Dict mapping station_id to StationCoordinate
         """
         # Collect all unique station IDs
-        station_ids = set()
-        for route in routes:
-            station_ids.add(route.departure_station_id)
-            station_ids.add(route.return_station_id)
+        station_ids = set(
+            chain.from_iterable(
+                (route.departure_station_id, route.return_station_id)
+                for route in routes
+            )
+        )
 
         logger.info(f"Fetching coordinates for {len(station_ids)} unique stations")
 
-        return self.analyzer.get_station_coordinates(list(station_ids))
+        # One query for all stations
+        return self.analyzer.get_station_coordinates(station_ids)
+
+    def _open_station_stream(
+        self,
+    ) -> ContextManager[Optional["StationFileStream"]]:
+        """Station file stream for the selected routes, if station files are on."""
+        if not self.config.generation.should_generate_individual():
+            return nullcontext()
+        self.writer.setup_directories()
+        return self.writer.open_station_stream(
+            self.bidirectional_map, per_station_filter=self.per_station_routes
+        )
 
     def _generate_geometries(
         self,
         routes: List[RouteStatistics],
         station_coords: Dict[str, StationCoordinate],
+        station_stream: Optional["StationFileStream"] = None,
     ) -> List[RouteGeometry]:
         """
         Generate route geometries using Valhalla.
@@ -371,92 +444,167 @@ class RoutePipeline:
         Args:
             routes: List of routes to generate
             station_coords: Station coordinates lookup
+            station_stream: Optional stream that each geometry is added to as
+                            it is generated
 
         Returns:
             List of successfully generated RouteGeometry objects
         """
-        # Prepare station pairs
-        station_pairs = []
-        skipped = 0
-
-        for route in routes:
-            # Check if we have coordinates for both stations
-            if (
-                route.departure_station_id not in station_coords
-                or route.return_station_id not in station_coords
-            ):
-                logger.warning(
-                    f"Missing coordinates for route: "
-                    f"{route.departure_station_id} → {route.return_station_id}"
-                )
-                skipped += 1
-                continue
-
-            from_station = station_coords[route.departure_station_id]
-            to_station = station_coords[route.return_station_id]
-            station_pairs.append((from_station, to_station))
+        # Prepare station pairs, skipping routes without coordinates for
+        # both stations
+        coord_keys = station_coords.keys()
+        station_pairs = [
+            (
+                station_coords[route.departure_station_id],
+                station_coords[route.return_station_id],
+            )
+            for route in routes
+            if route.departure_station_id in coord_keys
+            and route.return_station_id in coord_keys
+        ]
 
+        skipped = len(routes) - len(station_pairs)
         if skipped > 0:
-            logger.warning(f"Skipped {skipped} routes due to missing coordinates")
+            missing = {
+                station_id
+                for route in routes
+                for station_id in (route.departure_station_id, route.return_station_id)
+            } - coord_keys
+            logger.warning(
+                f"Skipped {skipped} routes due to missing coordinates for "
+                f"{len(missing)} stations: {nsmallest(10, missing)}"
+            )
 
-        # Generate routes in batch
-        return self.generator.generate_batch(station_pairs)
+        if self.cache is None:
+            results = self.generator.generate_iter(station_pairs)
+        else:
+            results = self._generate_with_cache(station_pairs, station_coords)
+
+        # Single pass over the geometries as they come in, picking out the
+        # global file's routes and feeding the station files on the way
+        global_route_keys = self.global_route_keys
+        add_to_stations = station_stream.add if station_stream is not None else None
+        routes = []
+        global_generated = []
+        for route in results:
+            routes.append(route)
+            if route.route_key in global_route_keys:
+                global_generated.append(route)
+            if add_to_stations is not None:
+                add_to_stations(route)
+        self.global_generated = global_generated
+
+        return routes
+
+    def _generate_with_cache(
+        self,
+        station_pairs: List[Tuple[StationCoordinate, StationCoordinate]],
+        station_coords: Dict[str, StationCoordinate],
+    ) -> Iterator[RouteGeometry]:
+        """
+        Generate route geometries, requesting only those not in the route cache.
+
+        New geometries are written to the cache in chunks as they arrive, so
+        an interrupted run keeps the routes it already fetched.
+
+        Args:
+            station_pairs: List of (from_station, to_station) tuples
+            station_coords: Station coordinates lookup
+
+        Yields:
+            Cached and newly generated RouteGeometry objects, in the order of
+            station_pairs
+        """
+        assert self.cache is not None
+        cached = self.cache.lookup(station_pairs)
+        misses = [pair for pair, route in zip(station_pairs, cached) if route is None]
+        logger.info(
+            f"Route cache: {len(station_pairs) - len(misses)} hits, "
+            f"{len(misses)} misses"
+        )
+        if misses:
+            self._check_valhalla()
+        else:
+            logger.info("✅ Route cache covers all routes, skipping Valhalla")
+
+        # generate_iter keeps the order of misses and skips failed routes
+        generated = self.generator.generate_iter(misses) if misses else iter(())
+        pending = next(generated, None)
+        new_routes = []
+        for (from_station, to_station), route in zip(station_pairs, cached):
+            if route is None:
+                if pending is None or (
+                    pending.departure_station_id != from_station.station_id
+                    or pending.return_station_id != to_station.station_id
+                ):
+                    continue  # Generation failed for this pair
+                route = pending
+                pending = next(generated, None)
+
+                new_routes.append(route)
+                if len(new_routes) >= _CACHE_FLUSH_SIZE:
+                    self.cache.store(new_routes, station_coords)
+                    new_routes = []
+            yield route
+
+        self.cache.store(new_routes, station_coords)
 
     def _write_output_files(
         self,
         generated_routes: List[RouteGeometry],
-        station_routes: Dict[str, List[RouteGeometry]],
+        station_stream: Optional["StationFileStream"] = None,
     ):
         """
         Write output files based on configuration.
 
         Args:
             generated_routes: List of all generated routes
-            station_routes: Routes organized by station
+            station_stream: Stream the routes were already added to, if any;
+                            per-station files are then finished from it
         """
-        self.writer.setup_directories()
+        gen_config = self.config.generation
+        if station_stream is None:
+            self.writer.setup_directories()
         created_files = []
 
         # Write global routes file if enabled
-        if self.config.generation.should_generate_global():
+        if gen_config.should_generate_global():
             logger.info("Writing global routes file...")
 
-            # Filter to only include global routes
-            global_route_keys = {r.route_key for r in self.global_routes}
-            global_generated = [
-                r for r in generated_routes if r.route_key in global_route_keys
-            ]
-
             assert (
-                self.config.generation.global_strategy is not None
+                gen_config.global_strategy is not None
             ), "global_strategy must not be None when generating global routes"
             filename = self.writer.write_global_routes(
-                global_generated, strategy=self.config.generation.global_strategy
+                self.global_generated,
+                strategy=gen_config.global_strategy,
             )
             created_files.append(filename)
-            logger.info(f"  Wrote {len(global_generated)} routes to {filename}")
+            logger.info(f"  Wrote {len(self.global_generated)} routes to {filename}")
 
         # Write station files if enabled
-        if self.config.generation.should_generate_individual():
+        if gen_config.should_generate_individual():
             logger.info("Writing per-station files...")
-            station_files = self.writer.write_station_routes(
-                station_routes,
-                self.bidirectional_map,
-                per_station_filter=self.per_station_routes,
-            )
+            if station_stream is not None:
+                station_files = station_stream.close()
+            else:
+                station_files = self.writer.write_routes_by_station(
+                    generated_routes,
+                    self.bidirectional_map,
+                    per_station_filter=self.per_station_routes,
+                )
             created_files.extend(station_files)
             logger.info(f"  Wrote {len(station_files)} station files")
 
         # Write aggregate routes file if enabled
-        if self.config.generation.should_generate_aggregate():
+        if gen_config.should_generate_aggregate():
             logger.info("Writing per-station aggregate file...")
             assert (
-                self.config.generation.per_station_aggregate_strategy is not None
+                gen_config.per_station_aggregate_strategy is not None
             ), "per_station_aggregate_strategy must not be None when generating aggregate routes"
             filename = self.writer.write_aggregate_routes(
                 generated_routes,
                 self.aggregate_routes,
-                strategy=self.config.generation.per_station_aggregate_strategy,
+                strategy=gen_config.per_station_aggregate_strategy,
             )
             created_files.append(filename)
             total_routes = sum(len(routes) for routes in self.aggregate_routes.values())
@@ -468,20 +616,11 @@ class RoutePipeline:
         logger.info("Writing manifest...")
         gen_stats = self.generator.get_statistics()
         metadata = {
-            "global_strategy": (
-                str(self.config.generation.global_strategy)
-                if self.config.generation.global_strategy
-                else None
-            ),
-            "individual_strategy": (
-                str(self.config.generation.individual_strategy)
-                if self.config.generation.individual_strategy
-                else None
-            ),
-            "aggregate_strategy": (
-                str(self.config.generation.per_station_aggregate_strategy)
-                if self.config.generation.per_station_aggregate_strategy
-                else None
+            # Strategy strings are cached on RouteSelectionStrategy
+            "global_strategy": _strategy_str(gen_config.global_strategy),
+            "individual_strategy": _strategy_str(gen_config.individual_strategy),
+            "aggregate_strategy": _strategy_str(
+                gen_config.per_station_aggregate_strategy
             ),
             "total_routes": len(generated_routes),
             "unique_routes": len(generated_routes),
@@ -502,6 +641,7 @@ class RoutePipeline:
             elapsed_seconds: Total elapsed time
         """
         gen_stats = self.generator.get_statistics()
+        gen_config = self.config.generation
 
         rate = routes_generated / elapsed_seconds if elapsed_seconds > 0 else 0
         success_rate = (
@@ -509,14 +649,12 @@ class RoutePipeline:
         )
 
         logger.info("\n📊 Pipeline Statistics:")
-        if self.config.generation.should_generate_global():
-            logger.info(f"   Global: {self.config.generation.global_strategy}")
-        if self.config.generation.should_generate_individual():
-            logger.info(f"   Individual: {self.config.generation.individual_strategy}")
-        if self.config.generation.should_generate_aggregate():
-            logger.info(
-                f"   Aggregate: {self.config.generation.per_station_aggregate_strategy}"
-            )
+        if gen_config.should_generate_global():
+            logger.info(f"   Global: {gen_config.global_strategy}")
+        if gen_config.should_generate_individual():
+            logger.info(f"   Individual: {gen_config.individual_strategy}")
+        if gen_config.should_generate_aggregate():
+            logger.info(f"   Aggregate: {gen_config.per_station_aggregate_strategy}")
         logger.info(f"   Routes requested: {routes_requested:,}")
         logger.info(f"   Routes generated: {routes_generated:,}")
         logger.info(f"   Routes failed: {gen_stats['routes_failed']:,}")
@@ -526,6 +664,30 @@ class RoutePipeline:
         logger.info(f"   Output directory: {self.config.output.base_dir}")
 
 
+# (option prefix, strategy used when neither --<prefix>-top nor --<prefix>-pct
+# is given). Aggregate has no default: it's only generated if requested.
+_SELECTION_GROUPS = (
+    ("global", RouteSelectionStrategy.create_top_n(5)),
+    ("individual", RouteSelectionStrategy.create_percentage(80.0)),
+    ("aggregate", None),
+)
+
+
+def _strategy_from(
+    args, prefix: str, default: Optional[RouteSelectionStrategy]
+) -> Optional[RouteSelectionStrategy]:
+    """Selection strategy for one route group from its --<prefix>-* options."""
+    if getattr(args, f"no_{prefix}", False):
+        return None
+    top = getattr(args, f"{prefix}_top", None)
+    if top:
+        return RouteSelectionStrategy.create_top_n(top)
+    pct = getattr(args, f"{prefix}_pct", None)
+    if pct:
+        return RouteSelectionStrategy.create_percentage(pct)
+    return default
+
+
 def build_config_from_args(args) -> PipelineConfig:
     """
     Build PipelineConfig from CLI arguments.
@@ -540,27 +702,11 @@ def build_config_from_args(args) -> PipelineConfig:
         ValueError: If configuration is invalid
     """
     # Validate mutually exclusive arguments
-    if (
-        hasattr(args, "global_top")
-        and hasattr(args, "global_pct")
-        and args.global_top
-        and args.global_pct
-    ):
-        raise ValueError("Cannot specify both --global-top and --global-pct")
-    if (
-        hasattr(args, "individual_top")
-        and hasattr(args, "individual_pct")
-        and args.individual_top
-        and args.individual_pct
-    ):
-        raise ValueError("Cannot specify both --individual-top and --individual-pct")
-    if (
-        hasattr(args, "aggregate_top")
-        and hasattr(args, "aggregate_pct")
-        and args.aggregate_top
-        and args.aggregate_pct
-    ):
-        raise ValueError("Cannot specify both --aggregate-top and --aggregate-pct")
+    for prefix, _ in _SELECTION_GROUPS:
+        if getattr(args, f"{prefix}_top", None) and getattr(
+            args, f"{prefix}_pct", None
+        ):
+            raise ValueError(f"Cannot specify both --{prefix}-top and --{prefix}-pct")
 
     # Handle deprecated phase argument
     if hasattr(args, "phase") and args.phase:
@@ -581,46 +727,10 @@ def build_config_from_args(args) -> PipelineConfig:
             individual_strategy = RouteSelectionStrategy.create_percentage(coverage)
         aggregate_strategy = None
     else:
-        # Determine global strategy
-        global_strategy = None
-        if not args.no_global:
-            if args.global_top:
-                global_strategy = RouteSelectionStrategy.create_top_n(args.global_top)
-            elif args.global_pct:
-                global_strategy = RouteSelectionStrategy.create_percentage(
-                    args.global_pct
-                )
-            else:
-                # Default: top 5 routes
-                global_strategy = RouteSelectionStrategy.create_top_n(5)
-
-        # Determine individual strategy
-        individual_strategy = None
-        if not args.no_individual:
-            if args.individual_top:
-                individual_strategy = RouteSelectionStrategy.create_top_n(
-                    args.individual_top
-                )
-            elif args.individual_pct:
-                individual_strategy = RouteSelectionStrategy.create_percentage(
-                    args.individual_pct
-                )
-            else:
-                # Default: 80% coverage
-                individual_strategy = RouteSelectionStrategy.create_percentage(80.0)
-
-        # Determine per-station aggregate strategy
-        aggregate_strategy = None
-        if not args.no_aggregate:
-            if args.aggregate_top:
-                aggregate_strategy = RouteSelectionStrategy.create_top_n(
-                    args.aggregate_top
-                )
-            elif args.aggregate_pct:
-                aggregate_strategy = RouteSelectionStrategy.create_percentage(
-                    args.aggregate_pct
-                )
-            # No default for aggregate - only generate if explicitly requested
+        global_strategy, individual_strategy, aggregate_strategy = (
+            _strategy_from(args, prefix, default)
+            for prefix, default in _SELECTION_GROUPS
+        )
 
     # Validate that at least one is enabled
     if (
@@ -634,18 +744,27 @@ def build_config_from_args(args) -> PipelineConfig:
         )
 
     # Create generation config
+    cache_kwargs = {}
+    if getattr(args, "no_cache", False):
+        cache_kwargs["route_cache_path"] = None
     gen_config = RouteGenerationConfig(
         global_strategy=global_strategy,
         individual_strategy=individual_strategy,
         per_station_aggregate_strategy=aggregate_strategy,
         min_trips_threshold=args.min_trips,
+        clear_route_cache=getattr(args, "clear_cache", False),
+        ensure_route_index=not getattr(args, "skip_index_check", False),
+        **cache_kwargs,
     )
 
     # Create complete pipeline config
     return PipelineConfig(
-        valhalla=ValhallaConfig(),
+        valhalla=ValhallaConfig(concurrency=getattr(args, "concurrency", 1)),
         database=DatabaseConfig.from_env(),
-        output=OutputConfig(),
+        output=OutputConfig(
+            compression_format=getattr(args, "compression", "gzip"),
+            compression_level=getattr(args, "compression_level", 9),
+        ),
         generation=gen_config,
     )
 
@@ -754,6 +873,41 @@ Examples:
         default=1,
         help="Minimum trips required for a route (default: 1)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Concurrent Valhalla route requests, e.g. its server_threads (default: 1)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Request every route from Valhalla without the route geometry cache",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Empty the route geometry cache before generating",
+    )
+    parser.add_argument(
+        "--skip-index-check",
+        action="store_true",
+        help="Don't create the covering route index on the trips table if missing",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=["gzip", "zstd"],
+        default="gzip",
+        help="Output compression; zstd needs the zstandard package (default: gzip)",
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        default=9,
+        metavar="N",
+        help="Compression level, lower is faster but larger (default: 9)",
+    )
     parser.add_argument(
         "--log-level",
         choices=["DEBUG", "INFO", "WARNING", "ERROR"],
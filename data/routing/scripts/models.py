@@ -1,11 +1,38 @@
 #!/usr/bin/env python3
 """Data models for route generation pipeline."""
 
-from dataclasses import dataclass
+import logging
+import os
+from dataclasses import dataclass, field
+from sys import intern
 from typing import Optional
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Range checks in __post_init__; derived fields are always computed.
+# MODELS_VALIDATE=0 skips the checks for pipelines that trust their inputs.
+_VALIDATE = os.getenv("MODELS_VALIDATE", "1") != "0"
+
+
+def canonical_route_key(a: str, b: str) -> str:
+    """
+    Route key for a station pair, independent of direction.
+
+    canonical_route_key("067", "030") == canonical_route_key("030", "067")
+    == "030-067"
+    """
+    return f"{a}-{b}" if a <= b else f"{b}-{a}"
+
+
+def _new_unchecked(cls, **fields):
+    """Create a frozen dataclass instance without running __post_init__."""
+    instance = object.__new__(cls)
+    for name, value in fields.items():
+        object.__setattr__(instance, name, value)
+    return instance
+
+
+@dataclass(slots=True, frozen=True)
 class StationCoordinate:
     """Station with geographic coordinates from database."""
 
@@ -15,17 +42,31 @@ class StationCoordinate:
 
     def __post_init__(self):
         """Validate coordinates."""
+        if not _VALIDATE:
+            return
         if not (-90 <= self.latitude <= 90):
             raise ValueError(f"Invalid latitude: {self.latitude}")
         if not (-180 <= self.longitude <= 180):
             raise ValueError(f"Invalid longitude: {self.longitude}")
 
+    @classmethod
+    def from_trusted(
+        cls, station_id: str, latitude: float, longitude: float
+    ) -> "StationCoordinate":
+        """
+        Create without validation, for coordinates the database already
+        guarantees to be in range (GEOGRAPHY(POINT, 4326) columns).
+        """
+        return _new_unchecked(
+            cls, station_id=station_id, latitude=latitude, longitude=longitude
+        )
+
     def to_valhalla_location(self) -> dict:
         """Convert to Valhalla API location format."""
         return {"lat": self.latitude, "lon": self.longitude}
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RouteStatistics:
     """Trip statistics for a station pair from database analysis."""
 
@@ -34,20 +75,14 @@ class RouteStatistics:
     trip_count: int
     avg_distance_m: float
     avg_duration_s: float
-
-    @property
-    def route_key(self) -> str:
-        """
-        Normalized route key for bidirectional deduplication.
-
-        Always returns stations in sorted order so that:
-        - RouteStatistics("030", "067", ...).route_key == "030-067"
-        - RouteStatistics("067", "030", ...).route_key == "030-067"
-
-        This ensures we only generate one geometry per station pair.
-        """
-        stations = sorted([self.departure_station_id, self.return_station_id])
-        return f"{stations[0]}-{stations[1]}"
+    # Normalized route key for bidirectional deduplication (derived).
+    #
+    # Always holds stations in sorted order so that:
+    # - RouteStatistics("030", "067", ...).route_key == "030-067"
+    # - RouteStatistics("067", "030", ...).route_key == "030-067"
+    #
+    # This ensures we only generate one geometry per station pair.
+    route_key: str = field(init=False, repr=False, compare=False)
 
     @property
     def is_reversed(self) -> bool:
@@ -55,16 +90,56 @@ class RouteStatistics:
         return self.departure_station_id > self.return_station_id
 
     def __post_init__(self):
-        """Validate statistics."""
-        if self.trip_count < 1:
-            raise ValueError(f"Trip count must be positive: {self.trip_count}")
-        if self.avg_distance_m < 0:
-            raise ValueError(f"Distance cannot be negative: {self.avg_distance_m}")
-        if self.avg_duration_s < 0:
-            raise ValueError(f"Duration cannot be negative: {self.avg_duration_s}")
+        """Validate statistics and derive the canonical route key."""
+        if _VALIDATE:
+            if self.trip_count < 1:
+                raise ValueError(f"Trip count must be positive: {self.trip_count}")
+            if self.avg_distance_m < 0:
+                raise ValueError(
+                    f"Distance cannot be negative: {self.avg_distance_m}"
+                )
+            if self.avg_duration_s < 0:
+                raise ValueError(
+                    f"Duration cannot be negative: {self.avg_duration_s}"
+                )
+
+        object.__setattr__(
+            self,
+            "route_key",
+            canonical_route_key(self.departure_station_id, self.return_station_id),
+        )
 
+    @classmethod
+    def from_trusted(
+        cls,
+        departure_station_id: str,
+        return_station_id: str,
+        trip_count: int,
+        avg_distance_m: float,
+        avg_duration_s: float,
+    ) -> "RouteStatistics":
+        """
+        Create without validation, for rows aggregated by the route queries.
 
-@dataclass
+        GROUP BY yields at least one trip per route and the trips table's
+        CHECK constraints keep distances and durations non-negative. The
+        route key is still derived, and interned so both directions of a
+        station pair share one key string.
+        """
+        return _new_unchecked(
+            cls,
+            departure_station_id=departure_station_id,
+            return_station_id=return_station_id,
+            trip_count=trip_count,
+            avg_distance_m=avg_distance_m,
+            avg_duration_s=avg_duration_s,
+            route_key=intern(
+                canonical_route_key(departure_station_id, return_station_id)
+            ),
+        )
+
+
+@dataclass(slots=True, frozen=True)
 class RouteGeometry:
     """Generated route geometry from Valhalla."""
 
@@ -74,26 +149,44 @@ class RouteGeometry:
     polyline: str  # Encoded polyline (precision 6)
     distance_km: float
     duration_minutes: float
+    # "forward" or "reverse" relative to the canonical key (derived)
+    direction: str = field(init=False, repr=False, compare=False)
+    # Values as written to output files, rounded once (derived)
+    distance_km_rounded: float = field(init=False, repr=False, compare=False)
+    duration_min_rounded: float = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        """Validate route geometry."""
-        import logging
-
-        logger = logging.getLogger(__name__)
-
-        if not self.polyline:
-            raise ValueError("Polyline cannot be empty")
-        if self.distance_km < 0:
-            raise ValueError(f"Distance cannot be negative: {self.distance_km}")
-        if self.duration_minutes < 0:
-            raise ValueError(f"Duration cannot be negative: {self.duration_minutes}")
-
-        # Sanity check for bicycle routes (warn about unusually long routes)
-        if self.distance_km > 100:
-            logger.warning(
-                f"Unusually long bicycle route: {self.distance_km:.1f}km "
-                f"for {self.route_key}"
-            )
+        """Validate route geometry and derive output fields."""
+        if _VALIDATE:
+            if not self.polyline:
+                raise ValueError("Polyline cannot be empty")
+            if self.distance_km < 0:
+                raise ValueError(f"Distance cannot be negative: {self.distance_km}")
+            if self.duration_minutes < 0:
+                raise ValueError(
+                    f"Duration cannot be negative: {self.duration_minutes}"
+                )
+
+            # Sanity check for bicycle routes (warn about unusually long routes)
+            if self.distance_km > 100:
+                logger.warning(
+                    f"Unusually long bicycle route: {self.distance_km:.1f}km "
+                    f"for {self.route_key}"
+                )
+
+        object.__setattr__(
+            self,
+            "direction",
+            (
+                "reverse"
+                if self.departure_station_id > self.return_station_id
+                else "forward"
+            ),
+        )
+        object.__setattr__(self, "distance_km_rounded", round(self.distance_km, 2))
+        object.__setattr__(
+            self, "duration_min_rounded", round(self.duration_minutes, 1)
+        )
 
     def to_file_entry(self, is_reverse: bool) -> "RouteFileEntry":
         """
@@ -112,7 +205,7 @@ class RouteGeometry:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RouteFileEntry:
     """Route entry format for JSON output files."""
 
@@ -134,6 +227,8 @@ class RouteFileEntry:
 
     def __post_init__(self):
         """Validate file entry."""
+        if not _VALIDATE:
+            return
         if self.direction not in ("forward", "reverse"):
             raise ValueError(
                 f"Direction must be 'forward' or 'reverse': {self.direction}"
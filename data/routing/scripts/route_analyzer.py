@@ -2,50 +2,256 @@
 """Database analysis for route generation."""
 
 import logging
-from typing import List, Dict, Optional
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from heapq import nsmallest
+from itertools import groupby
+from operator import attrgetter
+from sys import intern
+from typing import Iterable, Iterator, List, Dict, Optional
+import psycopg
+from psycopg import sql
 
 from models import RouteStatistics, StationCoordinate
 from config import DatabaseConfig
+from route_cache import QueryResultCache
+from route_dedup import split_bidirectional
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round-trip from server-side cursors
+_STREAM_ITERSIZE = 10_000
+
+_departure_station = attrgetter("departure_station_id")
+
+# Covering index for the route aggregation queries (see ensure_route_index)
+ROUTE_INDEX_NAME = "idx_trips_route_covering"
+
+
+def _route_from_row(row: tuple) -> RouteStatistics:
+    """
+    Build RouteStatistics from a route statistics query row.
+
+    Route queries select departure_station_id, return_station_id, trip_count,
+    avg_distance_m and avg_duration_s first, in that order, and rows are plain
+    tuples rather than per-row dicts. The averages are computed as float8
+    from integer sums (distance and duration are NOT NULL integer columns),
+    so they arrive as Python floats.
+
+    Station IDs are interned: the same few hundred IDs recur across every
+    route, so all routes then share one string object per station, and dict
+    lookups keyed by them can match on identity.
+    """
+    return RouteStatistics.from_trusted(
+        departure_station_id=intern(row[0]),
+        return_station_id=intern(row[1]),
+        trip_count=row[2],
+        avg_distance_m=row[3],
+        avg_duration_s=row[4],
+    )
+
 
 class RouteAnalyzer:
     """Analyzes trip data to identify routes for generation."""
 
-    def __init__(self, db_config: DatabaseConfig):
+    def __init__(
+        self,
+        db_config: DatabaseConfig,
+        query_cache: Optional[QueryResultCache] = None,
+    ):
         """
         Initialize route analyzer.
 
         Args:
             db_config: Database configuration
+            query_cache: Persistent cache for the route aggregation queries
+                         (None = always query the database)
         """
         self.config = db_config
-        self.conn: Optional[psycopg2.extensions.connection] = None
+        self.query_cache = query_cache
+        self.conn: Optional[psycopg.Connection] = None
+        # get_route_statistics results by (min_trips, limit), for this connection
+        self._route_stats_cache: Dict[tuple, List[RouteStatistics]] = {}
+        # Fingerprint of the trips table, for this connection
+        self._trips_version: Optional[str] = None
+        # Composed queries by template (see _sql)
+        self._queries: Dict[str, sql.Composed] = {}
 
     def connect(self):
         """Establish database connection."""
         try:
-            self.conn = psycopg2.connect(self.config.connection_string)
+            self.conn = psycopg.connect(self.config.connection_string)
             logger.info(f"Connected to database: {self.config.database}")
-        except psycopg2.Error as e:
+        except psycopg.Error as e:
             logger.error(f"Database connection failed: {e}")
             raise
 
     def close(self):
         """Close database connection."""
+        self._route_stats_cache.clear()
+        self._trips_version = None
         if self.conn:
             self.conn.close()
             logger.info("Database connection closed")
 
-    def get_route_statistics(self, min_trips: int = 1) -> List[RouteStatistics]:
+    def _sql(self, template: str) -> sql.Composed:
+        """
+        Compose a query template with the configured schema.
+
+        Templates refer to the schema as ``{schema}``, which is filled in as a
+        quoted identifier rather than formatted into the SQL text. Each
+        template is composed once per analyzer.
+        """
+        query = self._queries.get(template)
+        if query is None:
+            query = sql.SQL(template).format(schema=sql.Identifier(self.config.schema))
+            self._queries[template] = query
+        return query
+
+    def ensure_route_index(self) -> bool:
+        """
+        Create the covering route index on the trips table if it's missing.
+
+        The route queries group trips by station pair and average distance
+        and duration; with (departure_station_id, return_station_id) INCLUDE
+        (distance_meters, duration_seconds) they can use index-only scans
+        instead of reading the whole table. The index is built CONCURRENTLY,
+        so other sessions can keep writing trips meanwhile. A failed or
+        interrupted concurrent build leaves an INVALID index that the planner
+        ignores; it is dropped and rebuilt.
+
+        The DDL runs in autocommit mode, so any transaction left open by
+        earlier queries on this connection is committed first. The
+        connection's previous autocommit setting is restored afterwards.
+
+        Returns:
+            True if the index exists afterwards, False if it couldn't be
+            created (e.g. read-only database user)
+        """
+        if not self.conn:
+            raise RuntimeError("Not connected to database. Call connect() first.")
+
+        schema = self.config.schema
+        previous_autocommit = self.conn.autocommit
+        try:
+            # CREATE INDEX CONCURRENTLY can't run inside a transaction block,
+            # and psycopg only switches to autocommit outside of one
+            if not previous_autocommit:
+                self.conn.commit()
+            self.conn.autocommit = True
+
+            with self.conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT i.indisvalid
+                    FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = %s AND c.relname = %s
+                    """,
+                    (schema, ROUTE_INDEX_NAME),
+                )
+                row = cursor.fetchone()
+                if row is not None:
+                    if row[0]:
+                        return True
+
+                    logger.warning(
+                        f"Index {ROUTE_INDEX_NAME} is invalid (interrupted "
+                        "build?), dropping it to rebuild"
+                    )
+                    cursor.execute(
+                        sql.SQL("DROP INDEX CONCURRENTLY IF EXISTS {index}").format(
+                            index=sql.Identifier(schema, ROUTE_INDEX_NAME)
+                        )
+                    )
+
+                logger.info(
+                    f"Creating covering index {ROUTE_INDEX_NAME} on {schema}.trips "
+                    "(one-off, may take a while)..."
+                )
+                query = sql.SQL(
+                    """
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS {index}
+                    ON {schema}.trips (departure_station_id, return_station_id)
+                    INCLUDE (distance_meters, duration_seconds)
+                    WHERE departure_station_id != return_station_id
+                    """
+                ).format(
+                    index=sql.Identifier(ROUTE_INDEX_NAME),
+                    schema=sql.Identifier(schema),
+                )
+                cursor.execute(query)
+                logger.info(f"Created index {ROUTE_INDEX_NAME}")
+                return True
+
+        except psycopg.Error as e:
+            logger.warning(
+                f"Could not create index {ROUTE_INDEX_NAME}: {e}. "
+                "Route queries will scan the trips table."
+            )
+            return False
+
+        finally:
+            if self.conn.autocommit != previous_autocommit:
+                self.conn.autocommit = previous_autocommit
+
+    def _get_trips_version(self) -> str:
+        """
+        Cheap fingerprint of the trips table: row count and highest trip_id.
+
+        Any import into (or deletion from) the table changes it, which
+        invalidates cached aggregation results.
+        """
+        if self._trips_version is None:
+            with self.conn.cursor() as cursor:
+                cursor.execute(
+                    self._sql("SELECT COUNT(*), MAX(trip_id) FROM {schema}.trips")
+                )
+                count, max_trip_id = cursor.fetchone()
+            self._trips_version = f"{self.config.schema}:{count}:{max_trip_id}"
+        return self._trips_version
+
+    def _stream_rows(self, name: str, query: str, params: tuple) -> Iterator[tuple]:
+        """
+        Run a query template on a named (server-side) cursor and yield its rows.
+
+        Rows are fetched in batches of _STREAM_ITERSIZE as they are consumed,
+        so large route results aren't buffered client-side as a whole before
+        being turned into models. With a query cache, results for an unchanged
+        trips table are read from the cache instead.
+        """
+        if self.query_cache is None:
+            yield from self._query_rows(name, query, params)
+            return
+
+        version = self._get_trips_version()
+        cached = self.query_cache.get(version, query, params)
+        if cached is not None:
+            logger.info(f"Using cached {name} results ({len(cached)} rows)")
+            yield from cached
+            return
+
+        rows = []
+        for row in self._query_rows(name, query, params):
+            rows.append(row)
+            yield row
+        self.query_cache.put(version, query, params, rows)
+
+    def _query_rows(self, name: str, query: str, params: tuple) -> Iterator[tuple]:
+        """Yield the rows of a query template from a named cursor."""
+        with self.conn.cursor(name=name) as cursor:
+            cursor.itersize = _STREAM_ITERSIZE
+            cursor.execute(self._sql(query), params)
+            yield from cursor
+
+    def get_route_statistics(
+        self, min_trips: int = 1, limit: Optional[int] = None
+    ) -> List[RouteStatistics]:
         """
         Get route statistics for all station pairs.
 
         Args:
             min_trips: Minimum number of trips required
+            limit: Maximum number of routes to return (None = all)
 
         Returns:
             List of RouteStatistics ordered by trip count (descending)
@@ -53,40 +259,40 @@ class RouteAnalyzer:
         if not self.conn:
             raise RuntimeError("Not connected to database. Call connect() first.")
 
-        query = f"""
+        # The aggregation is the heaviest query here; repeat calls reuse it
+        cached = self._route_stats_cache.get((min_trips, limit))
+        if cached is not None:
+            return list(cached)
+
+        # LIMIT NULL returns all rows
+        query = """
             SELECT
                 departure_station_id,
                 return_station_id,
                 COUNT(*) as trip_count,
-                AVG(distance_meters) as avg_distance_m,
-                AVG(duration_seconds) as avg_duration_s
-            FROM {self.config.schema}.trips
+                SUM(distance_meters)::float8 / COUNT(*) as avg_distance_m,
+                SUM(duration_seconds)::float8 / COUNT(*) as avg_duration_s
+            FROM {schema}.trips
             WHERE departure_station_id != return_station_id
             GROUP BY departure_station_id, return_station_id
             HAVING COUNT(*) >= %s
             ORDER BY trip_count DESC
+            LIMIT %s
         """
 
         try:
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, (min_trips,))
-                rows = cursor.fetchall()
-
-                routes = [
-                    RouteStatistics(
-                        departure_station_id=row["departure_station_id"],
-                        return_station_id=row["return_station_id"],
-                        trip_count=row["trip_count"],
-                        avg_distance_m=float(row["avg_distance_m"] or 0),
-                        avg_duration_s=float(row["avg_duration_s"] or 0),
-                    )
-                    for row in rows
-                ]
+            routes = [
+                _route_from_row(row)
+                for row in self._stream_rows(
+                    "route_statistics", query, (min_trips, limit)
+                )
+            ]
 
-                logger.info(f"Found {len(routes)} routes with >= {min_trips} trips")
-                return routes
+            logger.info(f"Found {len(routes)} routes with >= {min_trips} trips")
+            self._route_stats_cache[(min_trips, limit)] = routes
+            return list(routes)
 
-        except psycopg2.Error as e:
+        except psycopg.Error as e:
             logger.error(f"Query failed: {e}")
             raise
 
@@ -100,8 +306,7 @@ class RouteAnalyzer:
         Returns:
             List of top N RouteStatistics
         """
-        all_routes = self.get_route_statistics(min_trips=1)
-        return all_routes[:n]
+        return self.get_route_statistics(min_trips=1, limit=n)
 
     def get_all_routes(self) -> List[RouteStatistics]:
         """
@@ -134,19 +339,19 @@ class RouteAnalyzer:
             raise RuntimeError("Not connected to database. Call connect() first.")
 
         # Query to get top N routes per station
-        query = f"""
+        query = """
             WITH ranked_routes AS (
                 SELECT
                     departure_station_id,
                     return_station_id,
                     COUNT(*) as trip_count,
-                    AVG(distance_meters) as avg_distance_m,
-                    AVG(duration_seconds) as avg_duration_s,
+                    SUM(distance_meters)::float8 / COUNT(*) as avg_distance_m,
+                    SUM(duration_seconds)::float8 / COUNT(*) as avg_duration_s,
                     ROW_NUMBER() OVER (
                         PARTITION BY departure_station_id
                         ORDER BY COUNT(*) DESC
                     ) as rank
-                FROM {self.config.schema}.trips
+                FROM {schema}.trips
                 WHERE departure_station_id != return_station_id
                 GROUP BY departure_station_id, return_station_id
             )
@@ -162,37 +367,24 @@ class RouteAnalyzer:
         """
 
         try:
-            from collections import defaultdict
-
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, (n,))
-                rows = cursor.fetchall()
-
-                # Organize by station
-                station_routes = defaultdict(list)
-
-                for row in rows:
-                    route = RouteStatistics(
-                        departure_station_id=row["departure_station_id"],
-                        return_station_id=row["return_station_id"],
-                        trip_count=row["trip_count"],
-                        avg_distance_m=float(row["avg_distance_m"] or 0),
-                        avg_duration_s=float(row["avg_duration_s"] or 0),
-                    )
-                    station_routes[row["departure_station_id"]].append(route)
-
-                # Convert to regular dict
-                result = dict(station_routes)
-
-                total_routes = sum(len(routes) for routes in result.values())
-                logger.info(
-                    f"Selected {total_routes} routes across {len(result)} stations "
-                    f"(top {n} per station)"
+            # Organize by station; rows arrive grouped by departure station
+            rows = self._stream_rows("station_top_n", query, (n,))
+            result = {
+                station_id: list(routes)
+                for station_id, routes in groupby(
+                    map(_route_from_row, rows), key=_departure_station
                 )
+            }
+
+            total_routes = sum(len(routes) for routes in result.values())
+            logger.info(
+                f"Selected {total_routes} routes across {len(result)} stations "
+                f"(top {n} per station)"
+            )
 
-                return result
+            return result
 
-        except psycopg2.Error as e:
+        except psycopg.Error as e:
             logger.error(f"Query failed: {e}")
             raise
 
@@ -221,13 +413,13 @@ class RouteAnalyzer:
             raise RuntimeError("Not connected to database. Call connect() first.")
 
         # Query to get routes per station with cumulative trip counts
-        query = f"""
+        query = """
             WITH station_trips AS (
                 -- Get total trips per departure station
                 SELECT
                     departure_station_id,
                     COUNT(*) as total_trips
-                FROM {self.config.schema}.trips
+                FROM {schema}.trips
                 WHERE departure_station_id != return_station_id
                 GROUP BY departure_station_id
             ),
@@ -237,9 +429,9 @@ class RouteAnalyzer:
                     departure_station_id,
                     return_station_id,
                     COUNT(*) as trip_count,
-                    AVG(distance_meters) as avg_distance_m,
-                    AVG(duration_seconds) as avg_duration_s
-                FROM {self.config.schema}.trips
+                    SUM(distance_meters)::float8 / COUNT(*) as avg_distance_m,
+                    SUM(duration_seconds)::float8 / COUNT(*) as avg_duration_s
+                FROM {schema}.trips
                 WHERE departure_station_id != return_station_id
                 GROUP BY departure_station_id, return_station_id
             ),
@@ -276,37 +468,24 @@ class RouteAnalyzer:
         """
 
         try:
-            from collections import defaultdict
-
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, (coverage_pct,))
-                rows = cursor.fetchall()
-
-                # Organize by station
-                station_routes = defaultdict(list)
-
-                for row in rows:
-                    route = RouteStatistics(
-                        departure_station_id=row["departure_station_id"],
-                        return_station_id=row["return_station_id"],
-                        trip_count=row["trip_count"],
-                        avg_distance_m=float(row["avg_distance_m"] or 0),
-                        avg_duration_s=float(row["avg_duration_s"] or 0),
-                    )
-                    station_routes[row["departure_station_id"]].append(route)
-
-                # Convert to regular dict
-                result = dict(station_routes)
-
-                total_routes = sum(len(routes) for routes in result.values())
-                logger.info(
-                    f"Selected {total_routes} routes across {len(result)} stations "
-                    f"for {coverage_pct}% per-station coverage"
+            # Organize by station; rows arrive grouped by departure station
+            rows = self._stream_rows("station_coverage", query, (coverage_pct,))
+            result = {
+                station_id: list(routes)
+                for station_id, routes in groupby(
+                    map(_route_from_row, rows), key=_departure_station
                 )
+            }
 
-                return result
+            total_routes = sum(len(routes) for routes in result.values())
+            logger.info(
+                f"Selected {total_routes} routes across {len(result)} stations "
+                f"for {coverage_pct}% per-station coverage"
+            )
 
-        except psycopg2.Error as e:
+            return result
+
+        except psycopg.Error as e:
             logger.error(f"Query failed: {e}")
             raise
 
@@ -322,30 +501,74 @@ class RouteAnalyzer:
         Returns:
             List of RouteStatistics covering coverage_pct of all trips
         """
-        all_routes = self.get_route_statistics(min_trips=1)
-
-        # Calculate target trip count
-        total_trips = sum(r.trip_count for r in all_routes)
-        target_trips = total_trips * (coverage_pct / 100.0)
-
-        # Sort by trip count and accumulate
-        routes_sorted = sorted(all_routes, key=lambda r: r.trip_count, reverse=True)
+        if not self.conn:
+            raise RuntimeError("Not connected to database. Call connect() first.")
 
-        cumulative_trips = 0
-        selected_routes = []
+        # Running trip totals are computed in the database, so only the
+        # selected routes are transferred and turned into RouteStatistics.
+        # A route is kept while the trips before it are short of the target,
+        # i.e. up to and including the route that reaches it.
+        query = """
+            WITH route_stats AS (
+                SELECT
+                    departure_station_id,
+                    return_station_id,
+                    COUNT(*) as trip_count,
+                    SUM(distance_meters)::float8 / COUNT(*) as avg_distance_m,
+                    SUM(duration_seconds)::float8 / COUNT(*) as avg_duration_s
+                FROM {schema}.trips
+                WHERE departure_station_id != return_station_id
+                GROUP BY departure_station_id, return_station_id
+            ),
+            ranked_routes AS (
+                SELECT
+                    r.*,
+                    SUM(r.trip_count) OVER (
+                        ORDER BY r.trip_count DESC,
+                                 r.departure_station_id,
+                                 r.return_station_id
+                        ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+                    ) as cumulative_trips,
+                    SUM(r.trip_count) OVER () as total_trips,
+                    ROW_NUMBER() OVER (
+                        ORDER BY r.trip_count DESC,
+                                 r.departure_station_id,
+                                 r.return_station_id
+                    ) as rank
+                FROM route_stats r
+            )
+            SELECT
+                departure_station_id,
+                return_station_id,
+                trip_count,
+                avg_distance_m,
+                avg_duration_s,
+                cumulative_trips,
+                total_trips
+            FROM ranked_routes
+            WHERE cumulative_trips - trip_count < total_trips * %s / 100.0
+               OR rank = 1  -- Always include at least one route
+            ORDER BY rank
+        """
 
-        for route in routes_sorted:
-            cumulative_trips += route.trip_count
-            selected_routes.append(route)
-            if cumulative_trips >= target_trips:
-                break
+        try:
+            selected_routes = []
+            cumulative_trips = total_trips = 0
+            for row in self._stream_rows("global_coverage", query, (coverage_pct,)):
+                selected_routes.append(_route_from_row(row))
+                cumulative_trips, total_trips = row[5], row[6]
+            cumulative_trips, total_trips = int(cumulative_trips), int(total_trips)
+
+            logger.info(
+                f"Selected {len(selected_routes)} routes for {coverage_pct}% "
+                f"global coverage ({cumulative_trips:,} / {total_trips:,} trips)"
+            )
 
-        logger.info(
-            f"Selected {len(selected_routes)} routes for {coverage_pct}% "
-            f"global coverage ({cumulative_trips:,} / {total_trips:,} trips)"
-        )
+            return selected_routes
 
-        return selected_routes
+        except psycopg.Error as e:
+            logger.error(f"Query failed: {e}")
+            raise
 
     def deduplicate_bidirectional(
         self, routes: List[RouteStatistics]
@@ -372,21 +595,9 @@ class RouteAnalyzer:
                 {"030-067": RouteStatistics("067→030")}  # Reverse mapping
             )
         """
-        seen_keys = {}
-        unique_routes = []
-        reverse_map = {}
-
-        for route in routes:
-            key = route.route_key
-
-            if key not in seen_keys:
-                # First time seeing this route pair
-                seen_keys[key] = route
-                unique_routes.append(route)
-            else:
-                # We've seen the reverse direction
-                # Store this as the reverse route
-                reverse_map[key] = route
+        # One pass over the canonical (direction-independent) route keys,
+        # which RouteStatistics derives once at construction
+        unique_routes, reverse_map = split_bidirectional(routes)
 
         logger.info(
             f"Deduplicated {len(routes)} routes to {len(unique_routes)} unique "
@@ -396,13 +607,16 @@ class RouteAnalyzer:
         return unique_routes, reverse_map
 
     def get_station_coordinates(
-        self, station_ids: List[str]
+        self, station_ids: Iterable[str]
     ) -> Dict[str, StationCoordinate]:
         """
         Fetch coordinates for given station IDs from PostGIS.
 
+        All stations are fetched with a single array query, however many IDs
+        are given.
+
         Args:
-            station_ids: List of station IDs to fetch
+            station_ids: Station IDs to fetch (duplicates are ignored)
 
         Returns:
             Dict mapping station_id to StationCoordinate
@@ -410,45 +624,47 @@ class RouteAnalyzer:
         if not self.conn:
             raise RuntimeError("Not connected to database. Call connect() first.")
 
-        # Remove duplicates
-        unique_ids = list(set(station_ids))
+        # Remove duplicates, keeping the order the IDs were given in
+        unique_ids = dict.fromkeys(station_ids)
+        if not unique_ids:
+            return {}
 
-        query = f"""
+        query = """
             SELECT
                 station_id,
                 ST_Y(location::geometry) as latitude,
                 ST_X(location::geometry) as longitude
-            FROM {self.config.schema}.stations
-            WHERE station_id = ANY(%s)
+            FROM {schema}.stations
+            WHERE station_id = ANY(%s::text[])
         """
 
         try:
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, (unique_ids,))
+            with self.conn.cursor() as cursor:
+                cursor.execute(self._sql(query), (list(unique_ids),))
                 rows = cursor.fetchall()
 
-                coordinates = {
-                    row["station_id"]: StationCoordinate(
-                        station_id=row["station_id"],
-                        latitude=float(row["latitude"]),
-                        longitude=float(row["longitude"]),
+                coordinates = {}
+                for station_id, latitude, longitude in rows:
+                    station_id = intern(station_id)
+                    coordinates[station_id] = StationCoordinate.from_trusted(
+                        station_id=station_id,
+                        latitude=float(latitude),
+                        longitude=float(longitude),
                     )
-                    for row in rows
-                }
 
                 logger.info(f"Fetched coordinates for {len(coordinates)} stations")
 
                 # Check for missing stations
-                missing = set(unique_ids) - set(coordinates.keys())
+                missing = unique_ids.keys() - coordinates.keys()
                 if missing:
                     logger.warning(
                         f"Missing coordinates for {len(missing)} stations: "
-                        f"{sorted(list(missing))[:10]}..."
+                        f"{nsmallest(10, missing)}..."
                     )
 
                 return coordinates
 
-        except psycopg2.Error as e:
+        except psycopg.Error as e:
             logger.error(f"Failed to fetch station coordinates: {e}")
             raise
 
@@ -462,32 +678,35 @@ class RouteAnalyzer:
         if not self.conn:
             raise RuntimeError("Not connected to database. Call connect() first.")
 
+        # Scalar subqueries, combined into one statement so the summary takes a
+        # single round-trip
         queries = {
-            "total_trips": f"SELECT COUNT(*) FROM {self.config.schema}.trips",
-            "unique_stations": f"SELECT COUNT(DISTINCT station_id) FROM {self.config.schema}.stations",
-            "unique_departure_stations": f"SELECT COUNT(DISTINCT departure_station_id) FROM {self.config.schema}.trips",
-            "unique_return_stations": f"SELECT COUNT(DISTINCT return_station_id) FROM {self.config.schema}.trips",
-            "unique_station_pairs": f"""
+            "total_trips": "SELECT COUNT(*) FROM {schema}.trips",
+            "unique_stations": "SELECT COUNT(DISTINCT station_id) FROM {schema}.stations",
+            "unique_departure_stations": "SELECT COUNT(DISTINCT departure_station_id) FROM {schema}.trips",
+            "unique_return_stations": "SELECT COUNT(DISTINCT return_station_id) FROM {schema}.trips",
+            "unique_station_pairs": """
                 SELECT COUNT(*) FROM (
                     SELECT DISTINCT departure_station_id, return_station_id
-                    FROM {self.config.schema}.trips
+                    FROM {schema}.trips
                     WHERE departure_station_id != return_station_id
                 ) AS pairs
             """,
         }
 
-        stats = {}
+        query = "SELECT " + ", ".join(
+            f"({subquery}) AS {key}" for key, subquery in queries.items()
+        )
+
         try:
             with self.conn.cursor() as cursor:
-                for key, query in queries.items():
-                    cursor.execute(query)
-                    result = cursor.fetchone()
-                    stats[key] = result[0] if result else 0
+                cursor.execute(self._sql(query))
+                stats = dict(zip(queries, cursor.fetchone()))
 
             logger.info(f"Database statistics: {stats}")
             return stats
 
-        except psycopg2.Error as e:
+        except psycopg.Error as e:
             logger.error(f"Failed to get statistics: {e}")
             raise
 
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Persistent caches of generated route geometries and query results."""
+
+import hashlib
+import logging
+import sqlite3
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models import StationCoordinate, RouteGeometry, canonical_route_key
+from route_encoders import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default limit on host parameters in one statement is 999
+_LOOKUP_CHUNK_SIZE = 500
+
+
+class RouteCache:
+    """
+    SQLite-backed cache of Valhalla route geometries.
+
+    Entries are keyed by a hash of the request signature: both station IDs,
+    their coordinates and the costing options. A station that moves, or a
+    change of costing or bicycle type, therefore misses the cache instead of
+    returning a stale geometry.
+    """
+
+    def __init__(self, path: Path, costing: str, bicycle_type: str):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path: SQLite database file
+            costing: Valhalla costing model of the cached requests
+            bicycle_type: Valhalla bicycle type of the cached requests
+        """
+        self.path = Path(path)
+        self.costing = costing
+        self.bicycle_type = bicycle_type
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS routes "
+            "(key TEXT PRIMARY KEY, payload BLOB NOT NULL)"
+        )
+        self.conn.commit()
+
+    def close(self):
+        """Close the cache file."""
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM routes").fetchone()[0]
+
+    def clear(self):
+        """Remove all cached geometries."""
+        self.conn.execute("DELETE FROM routes")
+        self.conn.commit()
+        logger.info(f"Cleared route cache: {self.path}")
+
+    def key(
+        self, from_station: StationCoordinate, to_station: StationCoordinate
+    ) -> str:
+        """Cache key for a route request between two stations."""
+        signature = (
+            f"{from_station.station_id}|{to_station.station_id}|"
+            f"{self.costing}|{self.bicycle_type}|"
+            f"{from_station.latitude},{from_station.longitude}->"
+            f"{to_station.latitude},{to_station.longitude}"
+        )
+        return hashlib.sha1(signature.encode("utf-8")).hexdigest()
+
+    def lookup(
+        self, station_pairs: List[Tuple[StationCoordinate, StationCoordinate]]
+    ) -> List[Optional[RouteGeometry]]:
+        """
+        Look up cached geometries for station pairs.
+
+        Args:
+            station_pairs: List of (from_station, to_station) tuples
+
+        Returns:
+            Cached RouteGeometry (or None on a miss) for each pair, in order
+        """
+        keys = [
+            self.key(from_station, to_station)
+            for from_station, to_station in station_pairs
+        ]
+
+        payloads: Dict[str, bytes] = {}
+        for start in range(0, len(keys), _LOOKUP_CHUNK_SIZE):
+            chunk = keys[start : start + _LOOKUP_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            payloads.update(
+                self.conn.execute(
+                    f"SELECT key, payload FROM routes WHERE key IN ({placeholders})",
+                    chunk,
+                )
+            )
+
+        results = []
+        for (from_station, to_station), key in zip(station_pairs, keys):
+            payload = payloads.get(key)
+            if payload is None:
+                results.append(None)
+                continue
+            data = loads(payload)
+            results.append(
+                RouteGeometry(
+                    route_key=canonical_route_key(
+                        from_station.station_id, to_station.station_id
+                    ),
+                    departure_station_id=from_station.station_id,
+                    return_station_id=to_station.station_id,
+                    polyline=data["polyline"],
+                    distance_km=data["distance_km"],
+                    duration_minutes=data["duration_minutes"],
+                )
+            )
+        return results
+
+    def store(
+        self,
+        routes: Iterable[RouteGeometry],
+        station_coords: Dict[str, StationCoordinate],
+    ):
+        """
+        Add generated geometries to the cache.
+
+        Args:
+            routes: Geometries returned by Valhalla
+            station_coords: Coordinates the geometries were requested with
+        """
+        rows = [
+            (
+                self.key(
+                    station_coords[route.departure_station_id],
+                    station_coords[route.return_station_id],
+                ),
+                dumps(
+                    {
+                        "polyline": route.polyline,
+                        "distance_km": route.distance_km,
+                        "duration_minutes": route.duration_minutes,
+                    }
+                ),
+            )
+            for route in routes
+        ]
+        self.conn.executemany("INSERT OR REPLACE INTO routes VALUES (?, ?)", rows)
+        self.conn.commit()
+
+
+class QueryResultCache:
+    """
+    SQLite-backed cache of database query results.
+
+    Rows are stored per (trips table version, query, parameters). The version
+    is a cheap fingerprint of the table the queries aggregate, so any import
+    into it makes every entry stale; stale entries are dropped when the next
+    result is stored.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path: SQLite database file (may be shared with RouteCache)
+        """
+        self.path = Path(path)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_results "
+            "(key TEXT PRIMARY KEY, version TEXT NOT NULL, payload BLOB NOT NULL)"
+        )
+        self.conn.commit()
+
+    def close(self):
+        """Close the cache file."""
+        self.conn.close()
+
+    def clear(self):
+        """Remove all cached query results."""
+        self.conn.execute("DELETE FROM query_results")
+        self.conn.commit()
+        logger.info(f"Cleared query result cache: {self.path}")
+
+    @staticmethod
+    def key(version: str, query: str, params: tuple) -> str:
+        """Cache key for a query run against a given table version."""
+        signature = f"{version}|{query}|{params!r}"
+        return hashlib.sha1(signature.encode("utf-8")).hexdigest()
+
+    def get(self, version: str, query: str, params: tuple) -> Optional[List[list]]:
+        """
+        Look up the rows of a query.
+
+        Returns:
+            Cached rows (as lists), or None on a miss
+        """
+        row = self.conn.execute(
+            "SELECT payload FROM query_results WHERE key = ?",
+            (self.key(version, query, params),),
+        ).fetchone()
+        return loads(row[0]) if row is not None else None
+
+    def put(self, version: str, query: str, params: tuple, rows: Iterable[tuple]):
+        """
+        Store the rows of a query, dropping results of other table versions.
+
+        Decimal values (from AVG and SUM over integer columns) are stored as
+        floats.
+        """
+        payload = dumps(
+            [
+                [float(value) if isinstance(value, Decimal) else value for value in row]
+                for row in rows
+            ]
+        )
+        self.conn.execute("DELETE FROM query_results WHERE version != ?", (version,))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO query_results VALUES (?, ?, ?)",
+            (self.key(version, query, params), version, payload),
+        )
+        self.conn.commit()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Bidirectional route deduplication loop.
+
+This is the per-route loop of RouteAnalyzer.deduplicate_bidirectional. Like
+route_encoders, the module is fully annotated so it can be compiled with
+mypyc (``mypyc route_dedup.py``) for runs over millions of station pairs;
+the compiled extension then shadows this file on import. Without it the
+pure-Python module is used unchanged.
+"""
+
+from typing import Dict, List, Tuple
+
+from models import RouteStatistics
+
+
+def split_bidirectional(
+    routes: List[RouteStatistics],
+) -> Tuple[List[RouteStatistics], Dict[str, RouteStatistics]]:
+    """
+    Split routes into first-seen directions and their reverse directions.
+
+    Args:
+        routes: Routes in priority order
+
+    Returns:
+        Tuple of:
+        - Routes whose canonical route key hadn't been seen yet, in order
+        - Dict mapping route_key to the later route with the same key
+    """
+    first_by_key: Dict[str, RouteStatistics] = {}
+    unique_routes: List[RouteStatistics] = []
+    reverse_map: Dict[str, RouteStatistics] = {}
+
+    for route in routes:
+        key = route.route_key
+
+        # Single hash lookup both checks and records the key
+        if first_by_key.setdefault(key, route) is route:
+            unique_routes.append(route)
+        else:
+            reverse_map[key] = route
+
+    return unique_routes, reverse_map
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+JSON encoders for the route output files.
+
+These are the per-route loops of the file writer. The module is fully
+annotated and works on plain tuples, so it can be compiled with mypyc
+(``mypyc route_encoders.py``); the compiled extension then shadows this
+file on import. Without it the pure-Python module is used unchanged.
+"""
+
+import json
+from typing import Dict, Iterable, List, Tuple, Union
+
+try:
+    import orjson
+
+    _HAVE_ORJSON = True
+except ImportError:  # Optional dependency
+    _HAVE_ORJSON = False
+
+# (route_key, from_station_id, to_station_id, polyline, distance_km, duration_min)
+RouteRow = Tuple[str, str, str, str, float, float]
+
+# (route_key, to_station_id, direction, polyline, distance_km, duration_min)
+StationEntry = Tuple[str, str, str, str, float, float]
+
+# Pre-encoded "direction" members spliced into station route entries
+_DIRECTION_MEMBERS: Dict[str, bytes] = {
+    "forward": b',"direction":"forward"',
+    "reverse": b',"direction":"reverse"',
+}
+
+
+def dumps(data: object, indent: bool = False) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes.
+
+    Uses orjson when available and falls back to the standard library.
+
+    Args:
+        data: Data to serialize
+        indent: Pretty-print with 2-space indentation instead of compact output
+    """
+    if _HAVE_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> object:
+    """Parse JSON bytes or text, using orjson when available."""
+    if _HAVE_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_route_list(rows: Iterable[RouteRow]) -> List[dict]:
+    """JSON entries for the single-file route lists (popular and global)."""
+    return [
+        {
+            "route_key": key,
+            "from": from_id,
+            "to": to_id,
+            "polyline": encoded,
+            "distance_km": distance_km,
+            "duration_min": duration_min,
+            "bidirectional": True,
+        }
+        for key, from_id, to_id, encoded, distance_km, duration_min in rows
+    ]
+
+
+def encode_station_payload(
+    station_id: str,
+    entries: Iterable[StationEntry],
+    fragment_cache: Dict[str, bytes],
+) -> bytearray:
+    """
+    Encode one station file.
+
+    Entries are written straight into the payload buffer, splicing the
+    per-direction fields in front of the cached route fragment, so only one
+    entry is held at a time.
+
+    Args:
+        station_id: Departure station of all entries
+        entries: Station entries in output order
+        fragment_cache: route_key -> encoded {"polyline", "distance_km",
+                        "duration_min"} object, filled on first use
+
+    Returns:
+        Encoded JSON payload
+    """
+    payload = bytearray(b'{"station_id":')
+    payload += dumps(station_id)
+    payload += b',"routes":['
+    count = 0
+    for key, to_id, direction, encoded, distance_km, duration_min in entries:
+        fragment = fragment_cache.get(key)
+        if fragment is None:
+            fragment = dumps(
+                {
+                    "polyline": encoded,
+                    "distance_km": distance_km,
+                    "duration_min": duration_min,
+                }
+            )
+            fragment_cache[key] = fragment
+
+        if count:
+            payload += b","
+        payload += b'{"to":'
+        payload += dumps(to_id)
+        payload += _DIRECTION_MEMBERS[direction]
+        payload += b',"bidirectional":true,'
+        payload += memoryview(fragment)[1:]
+        count += 1
+
+    payload += b'],"count":'
+    payload += str(count).encode()
+    payload += b"}"
+    return payload
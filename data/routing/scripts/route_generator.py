@@ -2,16 +2,32 @@
 """Valhalla route generation client."""
 
 import logging
+import threading
 import time
-from typing import Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, List, Tuple
 import requests
-import polyline
+from requests.adapters import HTTPAdapter
 
-from models import StationCoordinate, RouteGeometry
+from models import StationCoordinate, RouteGeometry, canonical_route_key
 from config import ValhallaConfig, GenerationConfig
+from route_encoders import dumps, loads
 
 logger = logging.getLogger(__name__)
 
+# Per-route warnings logged per batch before the rest are only counted
+_ROUTE_WARNING_LOG_CAP = 20
+
+
+def _is_encoded_polyline(shape: str) -> bool:
+    """
+    Cheap structural check of an encoded polyline.
+
+    Encoded polylines only use the characters '?' (63) to '~' (126); the
+    check runs in C over the string instead of decoding every coordinate.
+    """
+    return bool(shape) and shape.isascii() and "?" <= min(shape) and max(shape) <= "~"
+
 
 class RouteGenerator:
     """Generates bicycle routes using Valhalla routing engine."""
@@ -28,13 +44,89 @@ class RouteGenerator:
         """
         self.valhalla = valhalla_config
         self.generation = generation_config
+        # One keep-alive session for all requests, with a connection pool large
+        # enough that every concurrent request reuses an open connection
         self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.valhalla.concurrency
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Request bodies are sent pre-encoded (see generate_route)
+        self.session.headers["Content-Type"] = "application/json"
+
+        # Parts of the route request that are the same for every route
+        self._snap_options = {
+            "radius": self.valhalla.snap_radius_m,
+            "minimum_reachability": self.valhalla.min_reachability_nodes,
+        }
+        request_options = {
+            "costing": self.generation.costing,
+            "costing_options": {
+                "bicycle": {"bicycle_type": self.generation.bicycle_type}
+            },
+            "directions_options": {
+                "units": "kilometers",
+                "narrative": False,  # Exclude turn-by-turn text (reduces response size)
+                "maneuvers": False,  # Exclude maneuver details (reduces response size)
+            },
+        }
+        # Encoded members following "locations", without the opening brace
+        self._request_tail = b"," + dumps(request_options)[1:]
+        # Encoded request location per station (see _encoded_location)
+        self._locations: Dict[StationCoordinate, bytes] = {}
 
-        # Statistics
+        # Statistics (updated from worker threads in generate_batch)
+        self._stats_lock = threading.Lock()
         self.routes_generated = 0
         self.routes_failed = 0
         self.total_requests = 0
-        self.failed_routes = []  # Track failures with reasons for debugging
+        # Failures with reasons for debugging, as (from, to, reason, error_type)
+        self._failures: List[Tuple[str, str, str, str]] = []
+        self.route_warnings = 0  # Per-route warnings in the current batch
+
+    @property
+    def failed_routes(self) -> List[dict]:
+        """Failed routes with their reasons, built from the recorded failures."""
+        return [
+            {"from": from_id, "to": to_id, "reason": reason, "error_type": error_type}
+            for from_id, to_id, reason, error_type in self._failures
+        ]
+
+    def _record_failure(
+        self,
+        from_station: StationCoordinate,
+        to_station: StationCoordinate,
+        reason: str,
+        error_type: str,
+    ):
+        """Count a failed route and keep its reason."""
+        with self._stats_lock:
+            self.routes_failed += 1
+            self._failures.append(
+                (from_station.station_id, to_station.station_id, reason, error_type)
+            )
+
+    def _encoded_location(self, station: StationCoordinate) -> bytes:
+        """
+        Encoded Valhalla location for a station, with the snapping options.
+
+        A station takes part in many routes, so each location is built and
+        encoded once. Keyed by the station itself, coordinates included.
+        """
+        encoded = self._locations.get(station)
+        if encoded is None:
+            encoded = dumps({**station.to_valhalla_location(), **self._snap_options})
+            self._locations[station] = encoded
+        return encoded
+
+    def _warn_route(self, message: str):
+        """Log a per-route warning, or only count it once the cap is reached."""
+        with self._stats_lock:
+            self.route_warnings += 1
+            if self.route_warnings > _ROUTE_WARNING_LOG_CAP:
+                return
+        logger.warning(message)
 
     def test_connection(self) -> bool:
         """
@@ -69,54 +161,45 @@ class RouteGenerator:
         Returns:
             RouteGeometry if successful, None if route generation fails
         """
-        # Build Valhalla request with location snapping parameters
-        request_data = {
-            "locations": [
-                {
-                    **from_station.to_valhalla_location(),
-                    "radius": self.valhalla.snap_radius_m,
-                    "minimum_reachability": self.valhalla.min_reachability_nodes,
-                },
-                {
-                    **to_station.to_valhalla_location(),
-                    "radius": self.valhalla.snap_radius_m,
-                    "minimum_reachability": self.valhalla.min_reachability_nodes,
-                },
-            ],
-            "costing": self.generation.costing,
-            "costing_options": {
-                "bicycle": {"bicycle_type": self.generation.bicycle_type}
-            },
-            "directions_options": {
-                "units": "kilometers",
-                "narrative": False,  # Exclude turn-by-turn text (reduces response size)
-                "maneuvers": False,  # Exclude maneuver details (reduces response size)
-            },
-        }
+        # Build Valhalla request with location snapping parameters from
+        # pre-encoded parts: per-station locations and the shared options.
+        # The body is built once and reused for all retries
+        body = b"".join(
+            (
+                b'{"locations":[',
+                self._encoded_location(from_station),
+                b",",
+                self._encoded_location(to_station),
+                b"]",
+                self._request_tail,
+            )
+        )
 
         # Retry logic
         for attempt in range(1, self.valhalla.max_retries + 1):
             try:
-                self.total_requests += 1
+                with self._stats_lock:
+                    self.total_requests += 1
 
                 response = self.session.post(
                     self.valhalla.route_endpoint,
-                    json=request_data,
+                    data=body,
                     timeout=self.valhalla.timeout_seconds,
                 )
                 response.raise_for_status()
 
-                # Parse response
-                data = response.json()
+                # Parse response (orjson when available)
+                data = loads(response.content)
                 trip = data.get("trip", {})
                 legs = trip.get("legs", [])
 
                 if not legs:
-                    logger.warning(
+                    self._warn_route(
                         f"No route found: {from_station.station_id} → "
                         f"{to_station.station_id}"
                     )
-                    self.routes_failed += 1
+                    with self._stats_lock:
+                        self.routes_failed += 1
                     return None
 
                 leg = legs[0]
@@ -125,59 +208,53 @@ class RouteGenerator:
                 # Get encoded polyline (Valhalla uses precision-6 by default)
                 encoded_shape = leg.get("shape", "")
 
-                # Verify encoding by decoding and re-encoding
-                # This ensures we have precision-6 encoding
-                try:
-                    decoded = polyline.decode(encoded_shape, precision=6)
-                    verified_shape = polyline.encode(decoded, precision=6)
-                except Exception as e:
-                    logger.warning(
+                # Valhalla returns precision-6 shapes as-is; only check that
+                # the shape looks like an encoded polyline
+                if not _is_encoded_polyline(encoded_shape):
+                    self._warn_route(
                         f"Polyline encoding issue for "
-                        f"{from_station.station_id} → {to_station.station_id}: {e}"
+                        f"{from_station.station_id} → {to_station.station_id}: "
+                        "unexpected characters in shape"
                     )
-                    verified_shape = encoded_shape
 
                 # Create route key (canonical order)
-                stations = sorted([from_station.station_id, to_station.station_id])
-                route_key = f"{stations[0]}-{stations[1]}"
+                route_key = canonical_route_key(
+                    from_station.station_id, to_station.station_id
+                )
 
                 # Create RouteGeometry
                 route_geometry = RouteGeometry(
                     route_key=route_key,
                     departure_station_id=from_station.station_id,
                     return_station_id=to_station.station_id,
-                    polyline=verified_shape,
+                    polyline=encoded_shape,
                     distance_km=summary.get("length", 0.0),
                     duration_minutes=summary.get("time", 0.0) / 60.0,
                 )
 
-                self.routes_generated += 1
+                with self._stats_lock:
+                    self.routes_generated += 1
+                    generated, failed = self.routes_generated, self.routes_failed
 
                 # Log progress every N routes
-                if self.routes_generated % self.generation.log_interval == 0:
-                    logger.info(
-                        f"Generated {self.routes_generated} routes "
-                        f"({self.routes_failed} failed)"
-                    )
+                if generated % self.generation.log_interval == 0:
+                    logger.info(f"Generated {generated} routes ({failed} failed)")
 
                 return route_geometry
 
             except requests.HTTPError as e:
                 if e.response.status_code == 400:
                     # Bad request - route not possible
-                    logger.warning(
+                    self._warn_route(
                         f"Route not possible: {from_station.station_id} → "
                         f"{to_station.station_id} (HTTP 400)"
                     )
-                    self.failed_routes.append(
-                        {
-                            "from": from_station.station_id,
-                            "to": to_station.station_id,
-                            "reason": "Route not possible (HTTP 400)",
-                            "error_type": "HTTPError",
-                        }
+                    self._record_failure(
+                        from_station,
+                        to_station,
+                        "Route not possible (HTTP 400)",
+                        "HTTPError",
                     )
-                    self.routes_failed += 1
                     return None
                 elif attempt < self.valhalla.max_retries:
                     logger.warning(
@@ -190,7 +267,8 @@ class RouteGenerator:
                         f"Failed after {self.valhalla.max_retries} attempts: "
                         f"{from_station.station_id} → {to_station.station_id}"
                     )
-                    self.routes_failed += 1
+                    with self._stats_lock:
+                        self.routes_failed += 1
                     return None
 
             except requests.RequestException as e:
@@ -205,28 +283,14 @@ class RouteGenerator:
                         f"Request failed after {self.valhalla.max_retries} "
                         f"attempts: {e}"
                     )
-                    self.failed_routes.append(
-                        {
-                            "from": from_station.station_id,
-                            "to": to_station.station_id,
-                            "reason": str(e),
-                            "error_type": type(e).__name__,
-                        }
+                    self._record_failure(
+                        from_station, to_station, str(e), type(e).__name__
                     )
-                    self.routes_failed += 1
                     return None
 
             except Exception as e:
                 logger.error(f"Unexpected error generating route: {e}", exc_info=True)
-                self.failed_routes.append(
-                    {
-                        "from": from_station.station_id,
-                        "to": to_station.station_id,
-                        "reason": str(e),
-                        "error_type": type(e).__name__,
-                    }
-                )
-                self.routes_failed += 1
+                self._record_failure(from_station, to_station, str(e), type(e).__name__)
                 return None
 
         return None
@@ -243,36 +307,71 @@ class RouteGenerator:
         Returns:
             List of successfully generated RouteGeometry objects
         """
+        return list(self.generate_iter(station_pairs))
+
+    def generate_iter(
+        self, station_pairs: List[Tuple[StationCoordinate, StationCoordinate]]
+    ) -> Iterator[RouteGeometry]:
+        """
+        Generate routes for station pairs, yielding each as it completes.
+
+        Requests are independent, so with ValhallaConfig.concurrency > 1 they
+        are issued from a thread pool. Results keep the order of station_pairs;
+        failed routes are skipped.
+
+        Args:
+            station_pairs: List of (from_station, to_station) tuples
+
+        Yields:
+            Successfully generated RouteGeometry objects
+        """
         logger.info(f"Generating {len(station_pairs)} routes...")
 
         start_time = time.time()
-        routes = []
-
-        for i, (from_station, to_station) in enumerate(station_pairs, 1):
-            route = self.generate_route(from_station, to_station)
-
-            if route:
-                routes.append(route)
-
-            # Progress reporting with ETA every 100 routes
-            if i % 100 == 0:
-                elapsed = time.time() - start_time
-                rate = i / elapsed if elapsed > 0 else 0
-                remaining = (len(station_pairs) - i) / rate if rate > 0 else 0
-                logger.info(
-                    f"Progress: {i}/{len(station_pairs)} "
-                    f"({rate:.1f} routes/s, ETA: {remaining:.0f}s)"
-                )
+        generated = 0
+        self.route_warnings = 0
+
+        executor = None
+        if self.valhalla.concurrency > 1 and len(station_pairs) > 1:
+            executor = ThreadPoolExecutor(max_workers=self.valhalla.concurrency)
+            results = executor.map(
+                lambda pair: self.generate_route(*pair), station_pairs
+            )
+        else:
+            results = (self.generate_route(*pair) for pair in station_pairs)
+
+        try:
+            for i, route in enumerate(results, 1):
+                if route:
+                    generated += 1
+                    yield route
+
+                # Progress reporting with ETA every 100 routes
+                if i % 100 == 0:
+                    elapsed = time.time() - start_time
+                    rate = i / elapsed if elapsed > 0 else 0
+                    remaining = (len(station_pairs) - i) / rate if rate > 0 else 0
+                    logger.info(
+                        f"Progress: {i}/{len(station_pairs)} "
+                        f"({rate:.1f} routes/s, ETA: {remaining:.0f}s)"
+                    )
+        finally:
+            if executor is not None:
+                # Don't start queued requests if collecting was interrupted
+                executor.shutdown(cancel_futures=True)
 
         elapsed = time.time() - start_time
-        rate = len(routes) / elapsed if elapsed > 0 else 0
+        rate = generated / elapsed if elapsed > 0 else 0
 
         logger.info(
-            f"Batch complete: {len(routes)}/{len(station_pairs)} routes generated "
+            f"Batch complete: {generated}/{len(station_pairs)} routes generated "
             f"in {elapsed:.1f}s ({rate:.1f} routes/sec)"
         )
-
-        return routes
+        if self.route_warnings > _ROUTE_WARNING_LOG_CAP:
+            logger.warning(
+                f"{self.route_warnings - _ROUTE_WARNING_LOG_CAP} additional "
+                f"per-route warnings suppressed ({self.route_warnings} in total)"
+            )
 
     def get_statistics(self) -> dict:
         """
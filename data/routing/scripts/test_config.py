@@ -10,9 +10,46 @@ from config import (
     OutputConfig,
     GenerationConfig,
     PipelineConfig,
+    RouteSelectionStrategy,
+    _find_project_root,
+    clear_project_root_cache,
 )
 
 
+class TestProjectRoot:
+    def test_project_root_is_cached(self):
+        clear_project_root_cache()
+        assert _find_project_root() is _find_project_root()
+        assert _find_project_root.cache_info().hits >= 1
+
+    def test_clear_project_root_cache(self):
+        _find_project_root()
+        clear_project_root_cache()
+        assert _find_project_root.cache_info().currsize == 0
+
+
+class TestRouteSelectionStrategy:
+    def test_factories_reuse_instances(self):
+        assert RouteSelectionStrategy.create_top_n(
+            5
+        ) is RouteSelectionStrategy.create_top_n(5)
+        assert RouteSelectionStrategy.create_percentage(
+            80.0
+        ) is RouteSelectionStrategy.create_percentage(80.0)
+
+    def test_equal_int_and_float_not_shared(self):
+        assert str(RouteSelectionStrategy.create_percentage(80)) == "80% coverage"
+        assert (
+            str(RouteSelectionStrategy.create_percentage(80.0)) == "80.0% coverage"
+        )
+
+    def test_invalid_values(self):
+        with pytest.raises(ValueError, match="N must be positive"):
+            RouteSelectionStrategy.create_top_n(0)
+        with pytest.raises(ValueError, match="Percentage must be between"):
+            RouteSelectionStrategy.create_percentage(150.0)
+
+
 class TestValhallaConfig:
     def test_default_url(self):
         config = ValhallaConfig()
@@ -27,6 +64,10 @@ class TestValhallaConfig:
         with pytest.raises(ValueError, match="Invalid Valhalla URL"):
             ValhallaConfig(base_url="not-a-url")
 
+    def test_invalid_concurrency(self):
+        with pytest.raises(ValueError, match="Concurrency must be positive"):
+            ValhallaConfig(concurrency=0)
+
 
 class TestDatabaseConfig:
     def test_default_values(self):
@@ -84,11 +125,25 @@ class TestOutputConfig:
         assert path.name == "s030.json.gz"
         assert path.parent.name == "by-station"
 
+    def test_station_file_path_cached(self):
+        config = OutputConfig()
+        assert config.station_file_path("030") is config.station_file_path("030")
+
     def test_compression_settings(self):
         config = OutputConfig(use_compression=False)
         path = config.station_file_path("030")
         assert path.name == "s030.json"
 
+    def test_zstd_format(self):
+        config = OutputConfig(compression_format="zstd")
+        assert config.compression == "zstd"
+        assert config.station_file_path("030").name == "s030.json.zst"
+        assert config.top_routes_filename() == "top-1000.json.zst"
+
+    def test_invalid_compression_format(self):
+        with pytest.raises(ValueError, match="Invalid compression format"):
+            OutputConfig(compression_format="brotli")
+
 
 class TestGenerationConfig:
     def test_phase1_settings(self):
@@ -111,6 +166,46 @@ class TestGenerationConfig:
 
 
 class TestPipelineConfig:
+    def test_from_validated_dict(self, tmp_path):
+        os.environ["POSTGRES_PASSWORD"] = "test123"
+        config = PipelineConfig.from_validated_dict(
+            {
+                "valhalla": {"base_url": "http://valhalla:8002"},
+                "output": {"base_dir": tmp_path / "routes"},
+                "generation": {
+                    "global_strategy": RouteSelectionStrategy.create_top_n(10)
+                },
+            }
+        )
+        assert config.valhalla.route_endpoint == "http://valhalla:8002/route"
+        assert config.output.station_file_path("030").name == "s030.json.gz"
+        assert config.generation.should_generate_global()
+        assert not config.generation.should_generate_individual()
+
+    def test_from_validated_dict_invalid_sections(self):
+        os.environ["POSTGRES_PASSWORD"] = "test123"
+        for data in (
+            {"valhalla": {"base_url": "not-a-url"}},
+            {"valhalla": {"concurrency": 0}},
+            {"valhalla": {"bogus_field": 1}},
+            {"generation": {"batch_size": -5}},
+            {"output": {"compression_format": "brotli"}},
+            {"output": {"base_dir": 42}},
+        ):
+            with pytest.raises(ValueError):
+                PipelineConfig.from_validated_dict(data)
+
+    def test_from_validated_dict_str_base_dir(self, tmp_path):
+        os.environ["POSTGRES_PASSWORD"] = "test123"
+        config = PipelineConfig.from_validated_dict(
+            {"output": {"base_dir": str(tmp_path / "routes")}}
+        )
+        assert config.output.base_dir == tmp_path / "routes"
+
+    def test_from_validated_dict_unknown_section(self):
+        with pytest.raises(ValueError, match="Unknown configuration sections"):
+            PipelineConfig.from_validated_dict({"bogus": {}})
+
     def test_from_env(self):
         # Set required env vars
         os.environ["POSTGRES_PASSWORD"] = "test123"
@@ -9,7 +9,7 @@ from dotenv import load_dotenv
 def test_imports():
     """Test that all required packages can be imported."""
     try:
-        import psycopg2
+        import psycopg
         import requests
         import polyline
         from dotenv import load_dotenv
@@ -58,12 +58,12 @@ def test_database_connection():
     """Test database connectivity."""
     load_dotenv()
     try:
-        import psycopg2
+        import psycopg
 
-        conn = psycopg2.connect(
+        conn = psycopg.connect(
             host=os.getenv("POSTGRES_HOST"),
             port=os.getenv("POSTGRES_PORT"),
-            database=os.getenv("POSTGRES_DB"),
+            dbname=os.getenv("POSTGRES_DB"),
             user=os.getenv("POSTGRES_USER"),
             password=os.getenv("POSTGRES_PASSWORD"),
         )
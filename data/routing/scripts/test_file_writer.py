@@ -4,9 +4,11 @@
 import pytest
 import json
 import gzip
+from dataclasses import replace
 from pathlib import Path
 import shutil
 
+import file_writer
 from file_writer import RouteFileWriter
 from models import RouteGeometry, RouteStatistics
 from config import OutputConfig
@@ -209,7 +211,7 @@ class TestRouteFileWriter:
         compressed_size = (test_dir / "top-1000.json.gz").stat().st_size
 
         # Write without compression for comparison
-        writer.config.use_compression = False
+        writer = RouteFileWriter(replace(writer.config, use_compression=False))
         writer.write_popular_routes(sample_routes, "top-1000-uncompressed.json")
         uncompressed_size = (test_dir / "top-1000-uncompressed.json").stat().st_size
 
@@ -269,6 +271,125 @@ class TestRouteFileWriter:
         # Duration should be rounded to 1 decimal
         assert route["duration_min"] == 10.0
 
+    def test_write_routes_by_station_matches_two_step(
+        self, test_dir, sample_routes, bidirectional_map
+    ):
+        """Test fused organize+write produces the same files as the two-step path."""
+        fused = RouteFileWriter(OutputConfig(base_dir=test_dir / "fused"))
+        fused.setup_directories()
+        fused_files = fused.write_routes_by_station(sample_routes, bidirectional_map)
+
+        two_step = RouteFileWriter(OutputConfig(base_dir=test_dir / "two-step"))
+        two_step.setup_directories()
+        station_routes = two_step.organize_by_station(sample_routes, bidirectional_map)
+        two_step_files = two_step.write_station_routes(
+            station_routes, bidirectional_map
+        )
+
+        assert fused_files == two_step_files
+        for name in fused_files:
+            assert (fused.config.station_dir / name).read_bytes() == (
+                two_step.config.station_dir / name
+            ).read_bytes()
+
+    def test_station_stream_writes_complete_stations_early(
+        self, test_dir, sample_routes, bidirectional_map
+    ):
+        """Test a station's file is written once all of its filtered routes arrive."""
+        writer = RouteFileWriter(OutputConfig(base_dir=test_dir, write_workers=1))
+        writer.setup_directories()
+        per_station_filter = {
+            "067": [RouteStatistics("067", "030", 80, 2500, 600)],
+            "030": [
+                RouteStatistics("030", "067", 100, 2500, 600),
+                RouteStatistics("030", "045", 50, 1800, 480),
+            ],
+        }
+        station_file = test_dir / "by-station" / "s067.json.gz"
+
+        with writer.open_station_stream(
+            bidirectional_map, per_station_filter
+        ) as stream:
+            stream.add(sample_routes[0])
+            assert station_file.exists()
+            stream.add(sample_routes[1])
+            created_files = stream.close()
+
+        assert created_files == ["s030.json.gz", "s067.json.gz"]
+        with gzip.open(station_file, "rt") as f:
+            data = json.load(f)
+        assert data["count"] == 1
+        assert data["routes"][0]["to"] == "030"
+
+    def test_rewrite_with_changed_geometry(self, test_dir):
+        """Test a second write of the same route key uses the new geometry."""
+        writer = RouteFileWriter(OutputConfig(base_dir=test_dir, write_workers=1))
+        writer.setup_directories()
+        station_file = test_dir / "by-station" / "s030.json.gz"
+
+        for encoded, distance_km, duration_min in (
+            ("aaaa", 2.5, 10.0),
+            ("bbbb", 3.1, 12.5),
+        ):
+            routes = [
+                RouteGeometry(
+                    "030-067", "030", "067", encoded, distance_km, duration_min
+                )
+            ]
+            # Both the streaming and the two-step station writers
+            for write in (
+                lambda: writer.write_routes_by_station(routes, {}),
+                lambda: writer.write_station_routes(
+                    writer.organize_by_station(routes, {}), {}
+                ),
+            ):
+                assert write() == ["s030.json.gz"]
+                with gzip.open(station_file, "rt") as f:
+                    route = json.load(f)["routes"][0]
+                assert route["polyline"] == encoded
+                assert route["distance_km"] == distance_km
+                assert route["duration_min"] == duration_min
+
+    def test_gzip_levels_above_isal_use_zlib(self, monkeypatch):
+        """Test ISA-L is only used for the levels it supports."""
+        calls = []
+
+        class FakeIgzip:
+            @staticmethod
+            def compress(payload, compresslevel, mtime):
+                calls.append(compresslevel)
+                return gzip.compress(payload, compresslevel=compresslevel, mtime=0)
+
+        class FakeIsalZlib:
+            ISAL_BEST_COMPRESSION = 3
+
+        monkeypatch.setattr(file_writer, "igzip", FakeIgzip)
+        monkeypatch.setattr(file_writer, "isal_zlib", FakeIsalZlib, raising=False)
+        payload = b'{"routes":[]}' * 100
+
+        level_9 = file_writer._gzip_compress(payload, 9)
+        assert level_9 == gzip.compress(payload, compresslevel=9, mtime=0)
+        file_writer._gzip_compress(payload, 1)
+        assert calls == [1]
+
+    def test_zstd_station_files(self, test_dir, sample_routes, bidirectional_map):
+        """Test station files written with zstd compression."""
+        zstandard = pytest.importorskip("zstandard")
+        writer = RouteFileWriter(
+            OutputConfig(base_dir=test_dir, compression_format="zstd")
+        )
+        writer.setup_directories()
+
+        station_routes = writer.organize_by_station(sample_routes, bidirectional_map)
+        created_files = writer.write_station_routes(station_routes, bidirectional_map)
+
+        assert "s030.json.zst" in created_files
+        filepath = test_dir / "by-station" / "s030.json.zst"
+        payload = zstandard.ZstdDecompressor().decompress(filepath.read_bytes())
+        data = json.loads(payload)
+        assert data["station_id"] == "030"
+        assert data["count"] == 2
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
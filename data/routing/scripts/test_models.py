@@ -2,7 +2,14 @@
 """Unit tests for data models."""
 
 import pytest
-from models import StationCoordinate, RouteStatistics, RouteGeometry, RouteFileEntry
+import models
+from models import (
+    StationCoordinate,
+    RouteStatistics,
+    RouteGeometry,
+    RouteFileEntry,
+    canonical_route_key,
+)
 
 
 class TestStationCoordinate:
@@ -52,6 +59,34 @@ class TestRouteStatistics:
         with pytest.raises(ValueError, match="Distance cannot be negative"):
             RouteStatistics("030", "067", 100, -100.0, 600.0)
 
+    def test_immutable_without_dict(self):
+        route = RouteStatistics("030", "067", 100, 2500.0, 600.0)
+        assert not hasattr(route, "__dict__")
+        with pytest.raises(AttributeError):
+            route.trip_count = 5
+
+    def test_from_trusted(self):
+        route = RouteStatistics.from_trusted("067", "030", 80, 2500.0, 600.0)
+        assert route == RouteStatistics("067", "030", 80, 2500.0, 600.0)
+        assert route.route_key == "030-067"
+        assert route.is_reversed
+
+    def test_from_trusted_shares_route_key(self):
+        forward = RouteStatistics.from_trusted("030", "067", 100, 2500.0, 600.0)
+        reverse = RouteStatistics.from_trusted("067", "030", 80, 2500.0, 600.0)
+        assert forward.route_key is reverse.route_key
+
+    def test_validation_disabled(self, monkeypatch):
+        monkeypatch.setattr(models, "_VALIDATE", False)
+        route = RouteStatistics("067", "030", 0, 2500.0, 600.0)
+        assert route.route_key == "030-067"
+
+
+class TestCanonicalRouteKey:
+    def test_order_independent(self):
+        assert canonical_route_key("030", "067") == "030-067"
+        assert canonical_route_key("067", "030") == "030-067"
+
 
 class TestRouteGeometry:
     def test_valid_geometry(self):
@@ -66,6 +101,13 @@ class TestRouteGeometry:
         assert geom.route_key == "030-067"
         assert geom.polyline == "u`~nJqafxC"
 
+    def test_direction(self):
+        forward = RouteGeometry("030-067", "030", "067", "abc", 2.5, 10.0)
+        reverse = RouteGeometry("030-067", "067", "030", "abc", 2.5, 10.0)
+
+        assert forward.direction == "forward"
+        assert reverse.direction == "reverse"
+
     def test_to_file_entry_forward(self):
         geom = RouteGeometry("030-067", "030", "067", "abc", 2.5, 10.0)
         entry = geom.to_file_entry(is_reverse=False)
@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 """Integration tests for RouteAnalyzer."""
 
+import psycopg
 import pytest
 from route_analyzer import RouteAnalyzer
+from route_cache import QueryResultCache
 from config import DatabaseConfig
+from models import RouteStatistics
 
 
 class TestRouteAnalyzer:
@@ -152,5 +155,232 @@ class TestRouteAnalyzer:
         assert len(routes_80) > len(routes_50)
 
 
+class FakeCursor:
+    """Cursor that records executed queries and returns canned rows."""
+
+    def __init__(self, conn, name=None):
+        self.conn = conn
+        self.name = name
+        self.itersize = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        # Composed queries are recorded by their repr, which includes the SQL
+        self.conn.executed.append((str(query), params))
+        if not self.conn.autocommit:
+            self.conn.in_transaction = True
+
+    def fetchone(self):
+        if self.conn.one is not None:
+            return self.conn.one
+        return self.conn.rows[0] if self.conn.rows else None
+
+    def fetchall(self):
+        return self.conn.rows
+
+    def __iter__(self):
+        return iter(self.conn.rows)
+
+
+class FakeConnection:
+    def __init__(self, rows, one=None):
+        self.rows = rows
+        self.one = one  # fetchone() result, if not the first row
+        self._autocommit = False
+        self.in_transaction = False
+        self.executed = []
+        self.cursors = []
+
+    @property
+    def autocommit(self):
+        return self._autocommit
+
+    @autocommit.setter
+    def autocommit(self, value):
+        # Like psycopg 3, refuse to switch while a transaction is open
+        if self.in_transaction:
+            raise psycopg.ProgrammingError("can't change 'autocommit' now")
+        self._autocommit = value
+
+    def commit(self):
+        self.in_transaction = False
+
+    def cursor(self, name=None, cursor_factory=None):
+        cursor = FakeCursor(self, name)
+        self.cursors.append(cursor)
+        return cursor
+
+
+class TestRouteAnalyzerOffline:
+    """Unit tests against a fake connection (no database needed)."""
+
+    @pytest.fixture
+    def analyzer(self):
+        config = DatabaseConfig(
+            host="localhost",
+            port=5432,
+            database="test",
+            user="test",
+            password="test",
+            schema="hsl",
+        )
+        analyzer = RouteAnalyzer(config)
+        analyzer.conn = FakeConnection(
+            [
+                ("030", 60.1695, 24.9354),
+                ("067", 60.1712, 24.9412),
+            ]
+        )
+        return analyzer
+
+    def test_single_query(self, analyzer):
+        """All stations are fetched with one array query."""
+        coords = analyzer.get_station_coordinates(["030", "067", "030", "999"])
+
+        assert len(analyzer.conn.executed) == 1
+        query, params = analyzer.conn.executed[0]
+        assert "ANY(%s::text[])" in query
+        assert sorted(params[0]) == ["030", "067", "999"]
+        assert set(coords) == {"030", "067"}
+
+    def test_empty_input(self, analyzer):
+        """No query is run when there is nothing to fetch."""
+        assert analyzer.get_station_coordinates(set()) == {}
+        assert analyzer.conn.executed == []
+
+    def test_top_n_limits_in_query(self, analyzer):
+        """Top N is limited in SQL rather than by slicing all routes."""
+        analyzer.conn.rows = []
+        analyzer.get_top_n_routes(n=10)
+
+        query, params = analyzer.conn.executed[0]
+        assert "LIMIT %s" in query
+        assert params == (1, 10)
+
+    def test_schema_composed_as_identifier(self, analyzer):
+        """The schema is passed as a quoted identifier, composed once."""
+        analyzer.conn.rows = []
+        analyzer.get_top_n_routes(n=10)
+        analyzer.get_top_n_routes(n=20)
+
+        query, _ = analyzer.conn.executed[0]
+        assert "Identifier(" in query
+        assert "{schema}" not in query
+        assert len(analyzer._queries) == 1
+
+    def test_statistics_summary_single_query(self, analyzer):
+        """All summary counts come from one statement."""
+        analyzer.conn.rows = [(1000, 300, 290, 295, 5000)]
+
+        stats = analyzer.get_statistics_summary()
+
+        assert len(analyzer.conn.executed) == 1
+        assert stats == {
+            "total_trips": 1000,
+            "unique_stations": 300,
+            "unique_departure_stations": 290,
+            "unique_return_stations": 295,
+            "unique_station_pairs": 5000,
+        }
+
+    def test_routes_streamed_from_server_side_cursor(self, analyzer):
+        """Route rows are iterated from a named cursor, not fetched at once."""
+        analyzer.conn.rows = [("030", "067", 100, 2500.0, 600.0)]
+
+        routes = analyzer.get_route_statistics()
+
+        assert routes == [RouteStatistics("030", "067", 100, 2500.0, 600.0)]
+        (cursor,) = analyzer.conn.cursors
+        assert cursor.name is not None
+        assert cursor.itersize > 1
+
+    def test_route_statistics_memoized(self, analyzer):
+        """Repeated calls with the same arguments query the database once."""
+        analyzer.conn.rows = []
+
+        analyzer.get_all_routes()
+        analyzer.get_all_routes()
+        analyzer.get_top_n_routes(n=10)
+
+        assert len(analyzer.conn.executed) == 2
+
+    def test_query_cache(self, analyzer, tmp_path):
+        """Aggregation results are reused until the trips table changes."""
+        cache = QueryResultCache(tmp_path / "cache.sqlite")
+        analyzer.query_cache = cache
+        analyzer.conn = FakeConnection(
+            [("030", "067", 100, 2500.5, 600.0)], one=(10, 1)
+        )
+        routes = analyzer.get_route_statistics()
+
+        # Same table version: only the fingerprint query reaches the database
+        warm = RouteAnalyzer(analyzer.config, query_cache=cache)
+        warm.conn = FakeConnection([], one=(10, 1))
+        assert warm.get_route_statistics() == routes
+        assert len(warm.conn.executed) == 1
+
+        # New trips imported: the cached result is stale
+        stale = RouteAnalyzer(analyzer.config, query_cache=cache)
+        stale.conn = FakeConnection([], one=(11, 2))
+        assert stale.get_route_statistics() == []
+        cache.close()
+
+    def test_ensure_route_index(self, analyzer):
+        """The covering index is created only when missing, outside a transaction."""
+        analyzer.conn = FakeConnection([], one=(True,))
+        assert analyzer.ensure_route_index()
+        assert len(analyzer.conn.executed) == 1
+        assert "indisvalid" in analyzer.conn.executed[0][0]
+
+        analyzer.conn = FakeConnection([])
+        assert analyzer.ensure_route_index()
+        query, _ = analyzer.conn.executed[1]
+        assert "CREATE INDEX CONCURRENTLY" in query
+        assert "INCLUDE (distance_meters, duration_seconds)" in query
+        assert analyzer.conn.autocommit is False
+
+        # An INVALID index left by an interrupted build is dropped and rebuilt
+        analyzer.conn = FakeConnection([], one=(False,))
+        assert analyzer.ensure_route_index()
+        queries = [query for query, _ in analyzer.conn.executed]
+        assert len(queries) == 3
+        assert "DROP INDEX CONCURRENTLY IF EXISTS" in queries[1]
+        assert "CREATE INDEX CONCURRENTLY" in queries[2]
+        assert analyzer.conn.autocommit is False
+
+    def test_ensure_route_index_after_query(self, analyzer):
+        """An open transaction from earlier queries is ended first."""
+        analyzer.conn.one = (True,)
+        analyzer.get_station_coordinates(["030"])
+        assert analyzer.conn.in_transaction
+
+        assert analyzer.ensure_route_index()
+        assert analyzer.conn.autocommit is False
+
+        # A connection already in autocommit mode stays in it
+        analyzer.conn = FakeConnection([], one=(True,))
+        analyzer.conn.autocommit = True
+        assert analyzer.ensure_route_index()
+        assert analyzer.conn.autocommit is True
+
+    def test_deduplicate_bidirectional(self, analyzer):
+        """Reverse directions are mapped by canonical key, in one pass."""
+        forward = RouteStatistics("030", "067", 100, 2500.0, 600.0)
+        reverse = RouteStatistics("067", "030", 80, 2500.0, 600.0)
+        other = RouteStatistics("045", "030", 10, 1000.0, 300.0)
+
+        unique, reverse_map = analyzer.deduplicate_bidirectional(
+            [forward, reverse, other]
+        )
+
+        assert unique == [forward, other]
+        assert reverse_map == {"030-067": reverse}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Tests for RouteCache."""
+
+import pytest
+from decimal import Decimal
+from route_cache import QueryResultCache, RouteCache
+from models import StationCoordinate, RouteGeometry
+
+
+STATION_A = StationCoordinate("030", 60.1695, 24.9354)
+STATION_B = StationCoordinate("067", 60.1712, 24.9412)
+COORDS = {"030": STATION_A, "067": STATION_B}
+
+
+def make_geometry(from_id: str, to_id: str) -> RouteGeometry:
+    return RouteGeometry(
+        route_key="030-067",
+        departure_station_id=from_id,
+        return_station_id=to_id,
+        polyline="u`~nJqafxC",
+        distance_km=2.5,
+        duration_minutes=10.0,
+    )
+
+
+class TestRouteCache:
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+        return tmp_path / "cache" / "routes.sqlite"
+
+    @pytest.fixture
+    def cache(self, cache_path):
+        cache = RouteCache(cache_path, costing="bicycle", bicycle_type="Road")
+        yield cache
+        cache.close()
+
+    def test_miss(self, cache):
+        """Uncached pairs are returned as None."""
+        assert cache.lookup([(STATION_A, STATION_B)]) == [None]
+
+    def test_store_and_lookup(self, cache):
+        """Stored geometries are returned per direction, in request order."""
+        cache.store([make_geometry("030", "067")], COORDS)
+
+        result = cache.lookup([(STATION_B, STATION_A), (STATION_A, STATION_B)])
+
+        assert result[0] is None
+        assert result[1] == make_geometry("030", "067")
+        assert len(cache) == 1
+
+    def test_persists_across_instances(self, cache, cache_path):
+        """A new cache on the same file sees earlier entries."""
+        cache.store([make_geometry("030", "067")], COORDS)
+
+        reopened = RouteCache(cache_path, costing="bicycle", bicycle_type="Road")
+        try:
+            assert reopened.lookup([(STATION_A, STATION_B)]) == [
+                make_geometry("030", "067")
+            ]
+        finally:
+            reopened.close()
+
+    def test_moved_station_misses(self, cache):
+        """Changed coordinates are part of the key."""
+        cache.store([make_geometry("030", "067")], COORDS)
+        moved = StationCoordinate("067", 60.1800, 24.9412)
+
+        assert cache.lookup([(STATION_A, moved)]) == [None]
+
+    def test_costing_options_in_key(self, cache, cache_path):
+        """A different bicycle type doesn't reuse cached geometries."""
+        cache.store([make_geometry("030", "067")], COORDS)
+
+        other = RouteCache(cache_path, costing="bicycle", bicycle_type="Hybrid")
+        try:
+            assert other.lookup([(STATION_A, STATION_B)]) == [None]
+        finally:
+            other.close()
+
+    def test_clear(self, cache):
+        """clear() removes all entries."""
+        cache.store([make_geometry("030", "067")], COORDS)
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.lookup([(STATION_A, STATION_B)]) == [None]
+
+
+class TestQueryResultCache:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = QueryResultCache(tmp_path / "routes.sqlite")
+        yield cache
+        cache.close()
+
+    def test_store_and_lookup(self, cache):
+        """Rows come back as lists, with Decimals stored as floats."""
+        assert cache.get("v1", "SELECT 1", (5,)) is None
+
+        cache.put("v1", "SELECT 1", (5,), [("030", 100, Decimal("2500.5"))])
+
+        assert cache.get("v1", "SELECT 1", (5,)) == [["030", 100, 2500.5]]
+        assert cache.get("v1", "SELECT 1", (6,)) is None
+
+    def test_new_version_drops_stale_results(self, cache):
+        """Storing a result for a new table version removes the old ones."""
+        cache.put("v1", "SELECT 1", (), [(1,)])
+        cache.put("v2", "SELECT 2", (), [(2,)])
+
+        assert cache.get("v1", "SELECT 1", ()) is None
+        assert cache.get("v2", "SELECT 2", ()) == [[2]]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 """Tests for RouteGenerator."""
 
+import json
+
 import pytest
-from route_generator import RouteGenerator
+import requests
+from route_generator import RouteGenerator, _is_encoded_polyline
 from models import StationCoordinate
 from config import ValhallaConfig, GenerationConfig
 
@@ -73,5 +76,63 @@ class TestRouteGenerator:
         assert "success_rate_pct" in stats
 
 
+class TestRouteGeneratorOffline:
+    """Unit tests with a failing session (no Valhalla needed)."""
+
+    def test_failed_routes_recorded(self):
+        generator = RouteGenerator(ValhallaConfig(max_retries=1), GenerationConfig())
+
+        def post(*args, **kwargs):
+            raise requests.ConnectionError("refused")
+
+        generator.session.post = post
+        station_a = StationCoordinate("030", 60.1695, 24.9354)
+        station_b = StationCoordinate("067", 60.1712, 24.9412)
+
+        assert generator.generate_route(station_a, station_b) is None
+
+        stats = generator.get_statistics()
+        assert stats["routes_failed"] == 1
+        assert stats["failed_routes"] == [
+            {
+                "from": "030",
+                "to": "067",
+                "reason": "refused",
+                "error_type": "ConnectionError",
+            }
+        ]
+
+    def test_request_body(self):
+        generator = RouteGenerator(ValhallaConfig(max_retries=1), GenerationConfig())
+        sent = []
+
+        def post(url, data=None, timeout=None):
+            sent.append(data)
+            raise requests.ConnectionError("refused")
+
+        generator.session.post = post
+        station_a = StationCoordinate("030", 60.1695, 24.9354)
+        station_b = StationCoordinate("067", 60.1712, 24.9412)
+        generator.generate_route(station_a, station_b)
+        generator.generate_route(station_b, station_a)
+
+        body = json.loads(sent[-1])
+        assert [loc["lat"] for loc in body["locations"]] == [60.1712, 60.1695]
+        assert body["locations"][0]["radius"] == 100
+        assert body["costing"] == "bicycle"
+        # Each station's location is encoded once
+        assert len(generator._locations) == 2
+
+
+class TestIsEncodedPolyline:
+    def test_valid_shape(self):
+        assert _is_encoded_polyline("u`~nJqafxC")
+
+    def test_invalid_shape(self):
+        assert not _is_encoded_polyline("")
+        assert not _is_encoded_polyline("abc def")
+        assert not _is_encoded_polyline("abcé")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Tests for validate_coverage (reading generated station files)."""
+
+import pytest
+
+from config import OutputConfig
+from file_writer import RouteFileWriter
+from models import RouteGeometry, RouteStatistics
+from validate_coverage import load_station_destinations
+
+
+class TestLoadStationDestinations:
+    @pytest.fixture
+    def routes(self):
+        return [
+            RouteGeometry("030-067", "030", "067", "abc", 2.5, 10.0),
+            RouteGeometry("030-045", "030", "045", "def", 1.8, 8.0),
+        ]
+
+    def _write(self, config, routes):
+        writer = RouteFileWriter(config)
+        writer.setup_directories()
+        writer.write_routes_by_station(
+            routes, {"030-067": RouteStatistics("067", "030", 80, 2500, 600)}
+        )
+
+    def test_gzip_output(self, tmp_path, routes):
+        config = OutputConfig(base_dir=tmp_path / "routes", write_workers=1)
+        self._write(config, routes)
+
+        assert load_station_destinations("030", config) == {"067", "045"}
+        assert load_station_destinations("067", config) == {"030"}
+
+    def test_zstd_output(self, tmp_path, routes):
+        pytest.importorskip("zstandard")
+        config = OutputConfig(
+            base_dir=tmp_path / "routes", compression_format="zstd", write_workers=1
+        )
+        self._write(config, routes)
+
+        assert (tmp_path / "routes" / "by-station" / "s030.json.zst").exists()
+        assert load_station_destinations("030", config) == {"067", "045"}
+
+    def test_missing_station_file(self, tmp_path, routes):
+        config = OutputConfig(base_dir=tmp_path / "routes", write_workers=1)
+        self._write(config, routes)
+
+        assert load_station_destinations("999", config) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
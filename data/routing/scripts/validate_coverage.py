@@ -1,25 +1,59 @@
 #!/usr/bin/env python3
 """Validate per-station coverage for generated route files."""
 
-import json
-import gzip
+import argparse
 import sys
 from pathlib import Path
-from config import DatabaseConfig
+from typing import Optional, Set
+from config import DatabaseConfig, OutputConfig
+from file_writer import read_payload
 from route_analyzer import RouteAnalyzer
+from route_encoders import loads
 
 
-def validate_station_coverage(station_id: str, output_dir: Path) -> dict:
+def load_station_destinations(
+    station_id: str, output_config: OutputConfig
+) -> Optional[Set[str]]:
+    """
+    Read the destinations of a generated station file.
+
+    The file name and decompression follow output_config, the same way the
+    file writer chose them.
+
+    Args:
+        station_id: Station ID whose file to read
+        output_config: Output configuration the files were written with
+
+    Returns:
+        Set of destination station IDs, or None if the file doesn't exist
+    """
+    station_file = output_config.station_file_path(station_id)
+    if not station_file.exists():
+        return None
+
+    data = loads(read_payload(station_file, output_config.compression))
+    return {r["to"] for r in data["routes"]}
+
+
+def validate_station_coverage(
+    station_id: str, output_dir: Path, compression_format: str = "gzip"
+) -> dict:
     """
     Validate coverage for a specific station.
 
     Args:
         station_id: Station ID to validate
         output_dir: Output directory containing route files
+        compression_format: Compression the files were written with
+                            ("gzip" or "zstd")
 
     Returns:
         Dict with validation results
     """
+    output_config = OutputConfig(
+        base_dir=output_dir, compression_format=compression_format
+    )
+
     # Connect to database
     db = DatabaseConfig.from_env()
     analyzer = RouteAnalyzer(db)
@@ -58,17 +92,14 @@ def validate_station_coverage(station_id: str, output_dir: Path) -> dict:
         total_trips = sum(r[2] for r in actual_routes)
 
         # Load generated station file
-        station_file = output_dir / "by-station" / f"s{station_id}.json.gz"
-        if not station_file.exists():
+        generated_destinations = load_station_destinations(station_id, output_config)
+        if generated_destinations is None:
             return {
                 "station_id": station_id,
-                "error": f"Station file not found: {station_file}",
+                "error": "Station file not found: "
+                f"{output_config.station_file_path(station_id)}",
             }
 
-        with gzip.open(station_file, "rt") as f:
-            data = json.load(f)
-            generated_destinations = set(r["to"] for r in data["routes"])
-
         # Calculate coverage
         covered_trips = sum(
             r[2] for r in actual_routes if r[1] in generated_destinations
@@ -91,24 +122,33 @@ def validate_station_coverage(station_id: str, output_dir: Path) -> dict:
 
 def main():
     """Main validation script."""
-    if len(sys.argv) < 2:
-        print("Usage: python validate_coverage.py <station_id> [output_dir]")
-        print("\nExample:")
-        print("  python validate_coverage.py 030")
-        print("  python validate_coverage.py 030 /path/to/frontend/public/routes")
-        sys.exit(1)
-
-    station_id = sys.argv[1]
-    output_dir = (
-        Path(sys.argv[2])
-        if len(sys.argv) > 2
-        else Path("../../../frontend/public/routes")
+    parser = argparse.ArgumentParser(
+        description="Validate per-station coverage for generated route files",
+        epilog="Example: python validate_coverage.py 030 --compression zstd",
+    )
+    parser.add_argument("station_id", help="Station ID to validate")
+    parser.add_argument(
+        "output_dir",
+        nargs="?",
+        type=Path,
+        default=Path("../../../frontend/public/routes"),
+        help="Output directory containing route files",
     )
+    parser.add_argument(
+        "--compression",
+        choices=["gzip", "zstd"],
+        default="gzip",
+        help="Compression the files were written with (default: gzip)",
+    )
+    args = parser.parse_args()
+
+    station_id = args.station_id
+    output_dir = args.output_dir
 
     print(f"\n🔍 Validating coverage for station {station_id}...")
     print(f"   Output directory: {output_dir}\n")
 
-    result = validate_station_coverage(station_id, output_dir)
+    result = validate_station_coverage(station_id, output_dir, args.compression)
 
     if "error" in result:
         print(f"❌ Error: {result['error']}")
@@ -96,6 +96,9 @@ CREATE INDEX IF NOT EXISTS idx_trips_return_weekday ON hsl.trips(return_weekday)
 CREATE INDEX IF NOT EXISTS idx_trips_departure_station ON hsl.trips(departure_station_id);
 CREATE INDEX IF NOT EXISTS idx_trips_return_station ON hsl.trips(return_station_id);
 CREATE INDEX IF NOT EXISTS idx_trips_route ON hsl.trips(departure_station_id, return_station_id);
+CREATE INDEX IF NOT EXISTS idx_trips_route_covering ON hsl.trips(departure_station_id, return_station_id)
+    INCLUDE (distance_meters, duration_seconds)
+    WHERE departure_station_id <> return_station_id;
 
 -- Add comments
 COMMENT ON TABLE hsl.trips IS 'HSL city bike trip records (Origin-Destination data)';
@@ -104,6 +107,7 @@ COMMENT ON COLUMN hsl.trips.duration_seconds IS 'Trip duration in seconds';
 COMMENT ON CONSTRAINT valid_average_speed ON hsl.trips IS 'Prevents trips with average speed > 50 km/h';
 COMMENT ON INDEX idx_trips_departure_time IS 'Primary temporal index for recent trips';
 COMMENT ON INDEX idx_trips_route IS 'Composite index for route popularity analysis';
+COMMENT ON INDEX idx_trips_route_covering IS 'Covering index for route statistics aggregation (index-only scans)';
 
 -- ============================================================================
 -- Analyze table for query planner